@@ -3,29 +3,61 @@
 平日に実行して、過去のレースデータを取得する
 参考: https://note.com/dijzpeb/n/n6b025960fbff
 """
+import atexit
+import gzip
 import json
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import os
 from datetime import datetime, timedelta
 import random
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
+try:
+    # selectolax 1.0以降はModestバックエンド（selectolax.parser）が使えないためLexborを使う
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    # 未インストールの場合はBeautifulSoupでパースする
+    HTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = 'lxml'
+except ImportError:
+    # lxmlがない場合は標準のhtml.parserを使う
+    _BS4_PARSER = 'html.parser'
+
+try:
+    import orjson
+except ImportError:
+    # 未インストールの場合は標準のjsonモジュールを使う
+    orjson = None
+
+try:
+    import jpholiday
+except ImportError:
+    # 未インストールの場合は簡易的な祝日判定を使う
+    jpholiday = None
+
 # config読み込み
 config_path = Path(__file__).parent.parent / 'config.json'
 if not config_path.exists():
     # GitHub Actionsなどで実行される場合はカレントディレクトリから
     config_path = Path('config.json')
-with open(config_path, 'r', encoding='utf-8') as f:
-    config = json.load(f)
+if orjson is not None:
+    config = orjson.loads(config_path.read_bytes())
+else:
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
 
 # ===== リクエスト管理用のグローバル変数 =====
-last_request_time = 0
 request_count = 0
 request_count_date = None
 
@@ -34,19 +66,88 @@ request_settings = config.get('request_settings', {})
 MIN_REQUEST_INTERVAL = request_settings.get('min_interval', 1.5)
 MAX_REQUESTS_WEEKDAY = request_settings.get('max_requests_weekday', 8000)
 MAX_REQUESTS_WEEKEND = request_settings.get('max_requests_weekend', 150)
+# 連続して送信できるリクエスト数（長期的な平均間隔はMIN_REQUEST_INTERVALのまま）
+REQUEST_BURST = request_settings.get('burst', 3)
+# 同時に実行するリクエスト数（通信待ちを重ねるため。送信間隔はレート制限で制御）
+MAX_WORKERS = request_settings.get('max_workers', 8)
+
+# 保存設定（HTMLをgzip圧縮して.bin.gzで保存するか）
+storage_settings = config.get('storage', {})
+COMPRESS_HTML = storage_settings.get('compress_html', False)
+
+class TokenBucket:
+    """トークンバケット方式のレート制限（スレッドセーフ）"""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate: 1秒あたりのトークン補充数
+            capacity: バケット容量（連続して送信できる最大リクエスト数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """トークンを1つ取得する（不足している場合は補充されるまで待機）"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # 先に消費してから待つことで、待機中のスレッド同士でも送信順が予約される
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def restore(self, tokens, elapsed):
+        """
+        保存しておいたトークン残量を復元
+
+        Args:
+            tokens: 保存時のトークン残量
+            elapsed: 保存からの経過時間（秒）
+        """
+        with self._lock:
+            self.tokens = min(self.capacity, tokens + elapsed * self.rate)
+            self.last_refill = time.monotonic()
+
+# 全リクエストで共有するレート制限
+rate_limiter = TokenBucket(rate=1 / MIN_REQUEST_INTERVAL, capacity=REQUEST_BURST)
+
+# リクエスト状態の保存間隔（リクエスト数）
+STATE_SAVE_INTERVAL = 10
+_state_lock = threading.Lock()
+# リクエスト数の上限確認と加算をまとめて行うためのロック（並列実行時の数え漏れ・上限超過を防ぐ）
+_count_lock = threading.Lock()
+
+# ===== HTML解析用の正規表現 =====
+_RACE_ID_RE = re.compile(r'race_id=(\d+)')
+# レース結果HTML（bytes）から直接馬IDを拾うためのパターン（DOMを構築しない）
+_HORSE_HREF_RE = re.compile(rb'href=["\'][^"\']*?/horse/(\d+)/')
+_KAISAI_RE = re.compile(r'kaisai_date=(\d+)')
+
+# User-Agentの候補（リクエストごとにランダムに選ぶ）
+_UA_POOL = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+)
+
+class _RotatingUserAgentAdapter(HTTPAdapter):
+    """送信するリクエストごとにUser-Agentを選び直すHTTPAdapter"""
+
+    def add_headers(self, request, **kwargs):
+        request.headers['User-Agent'] = random.choice(_UA_POOL)
 
 def create_session():
     """スクレイピング対策を施したセッションを作成"""
     session = requests.Session()
 
-    # User-Agentのランダム化
-    user_agents = [
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    ]
     session.headers.update({
-        'User-Agent': random.choice(user_agents),
+        'User-Agent': random.choice(_UA_POOL),
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
         'Accept-Encoding': 'gzip, deflate, br',
@@ -54,13 +155,22 @@ def create_session():
         'Upgrade-Insecure-Requests': '1',
     })
 
-    # リトライ戦略
+    # リトライ戦略（429/5xxはRetry-Afterヘッダーに従って待機してからリトライ）
     retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
+        total=5,
+        backoff_factor=1.5,
         status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+    )
+    # 接続プールは同時実行数に合わせる（全リクエストが*.netkeiba.comのため、ホスト数は少ない）
+    # User-Agentはアダプターがリクエストごとにランダム化する
+    adapter = _RotatingUserAgentAdapter(
+        max_retries=retry_strategy,
+        pool_connections=4,
+        pool_maxsize=max(MAX_WORKERS, 10),
+        pool_block=False,
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -69,28 +179,41 @@ def create_session():
 # グローバルセッション（再利用して接続を維持）
 session = create_session()
 
+# 今日の日付とリクエスト上限のキャッシュ（日付が変わったときだけ計算し直す）
+_cached_today = None
+_cached_max = None
+# 次の日付変更（翌日0時）のUNIX時刻。これより前なら日付の確認を省略する
+_next_midnight_ts = 0.0
+
 def get_max_requests_for_today():
     """今日のリクエスト上限を取得（平日/土日で分ける）"""
-    today = datetime.now().date()
-    is_weekend = today.weekday() >= 5
-    return MAX_REQUESTS_WEEKEND if is_weekend else MAX_REQUESTS_WEEKDAY
+    reset_request_count_if_needed()
+    return _cached_max
 
 def reset_request_count_if_needed():
     """日付が変わったらリクエスト数をリセット"""
-    global request_count, request_count_date
-    today = datetime.now().date()
-    if request_count_date != today:
-        request_count = 0
-        request_count_date = today
-        print(f"[リクエストカウントリセット] 日付: {today}, 上限: {get_max_requests_for_today()}")
+    global request_count, request_count_date, _cached_today, _cached_max, _next_midnight_ts
+    # 翌日0時までは日付が変わらないため、時刻の比較だけで済ませる
+    if time.time() < _next_midnight_ts:
+        return
+    # safe_requestが並列にリクエスト数を加算しているため、リセットも同じロックの中で行う
+    with _count_lock:
+        today = datetime.now().date()
+        if _cached_today != today:
+            _cached_today = today
+            _cached_max = MAX_REQUESTS_WEEKEND if today.weekday() >= 5 else MAX_REQUESTS_WEEKDAY
+            _next_midnight_ts = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        if request_count_date != today:
+            request_count = 0
+            request_count_date = today
+            print(f"[リクエストカウントリセット] 日付: {today}, 上限: {_cached_max}")
 
 def get_request_status():
     """現在のリクエスト状態を取得"""
     reset_request_count_if_needed()
-    max_requests = get_max_requests_for_today()
+    max_requests = _cached_max
     remaining = max_requests - request_count
-    today = datetime.now().date()
-    is_weekend = today.weekday() >= 5
+    is_weekend = _cached_today.weekday() >= 5
     return {
         'count': request_count,
         'max': max_requests,
@@ -100,69 +223,181 @@ def get_request_status():
         'type': 'weekend' if is_weekend else 'weekday'
     }
 
-def safe_request(url, max_retries=3, timeout=None):
+def load_json(file_path):
+    """JSONファイルを読み込み（orjsonがあればそちらを使う）"""
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(data, file_path):
+    """JSONファイルを保存（書き込み途中で中断されても壊れないよう、一時ファイル経由で置き換える）"""
+    tmp_path = file_path.with_suffix('.tmp')
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    os.replace(tmp_path, file_path)
+
+def load_request_state():
+    """
+    保存されたリクエスト状態を読み込み（再起動してもその日のリクエスト数を引き継ぐ）
+    """
+    global request_count, request_count_date
+    if not REQUEST_STATE_PATH.exists():
+        return
+
+    try:
+        state = load_json(REQUEST_STATE_PATH)
+    except Exception as e:
+        print(f"[警告] リクエスト状態の読み込みエラー: {e}")
+        return
+
+    if state.get('date') == datetime.now().date().isoformat():
+        request_count = state.get('count', 0)
+        request_count_date = datetime.now().date()
+
+    # 前回終了時のトークン残量を、経過時間分の補充を加えて復元
+    if 'tokens' in state:
+        elapsed = max(0.0, time.time() - state.get('saved_at', 0))
+        rate_limiter.restore(state['tokens'], elapsed)
+
+def save_request_state():
+    """現在のリクエスト状態をファイルに保存"""
+    state = {
+        'date': request_count_date.isoformat() if request_count_date else None,
+        'count': request_count,
+        'tokens': rate_limiter.tokens,
+        'saved_at': time.time(),
+    }
+    try:
+        with _state_lock:
+            save_json(state, REQUEST_STATE_PATH)
+    except Exception as e:
+        print(f"[警告] リクエスト状態の保存エラー: {e}")
+
+def safe_request(url, timeout=None):
     """
     スクレイピング対策を施した安全なリクエスト関数
+    リトライはセッションのHTTPAdapterに任せる
 
     Args:
         url: リクエスト先URL
-        max_retries: 最大リトライ回数
         timeout: タイムアウト時間（秒）
 
     Returns:
         Responseオブジェクト（失敗時はNone）
     """
-    global last_request_time, request_count
+    global request_count
 
     reset_request_count_if_needed()
 
-    max_requests = get_max_requests_for_today()
-    if request_count >= max_requests:
-        today = datetime.now().date()
-        is_weekend = today.weekday() >= 5
+    max_requests = _cached_max
+    with _count_lock:
+        limit_reached = request_count >= max_requests
+        if not limit_reached:
+            # 上限の確認と同時に1回分を確保する（送信前に数えるため、並列に呼ばれても上限を超えない）
+            request_count += 1
+            save_state = request_count % STATE_SAVE_INTERVAL == 0
+
+    if limit_reached:
+        is_weekend = _cached_today.weekday() >= 5
         print(f"[警告] リクエスト上限に到達 ({request_count}/{max_requests}, {'週末' if is_weekend else '平日'})")
         return None
 
-    # レート制限（最小間隔を確保）
-    current_time = time.time()
-    elapsed = current_time - last_request_time
-    if elapsed < MIN_REQUEST_INTERVAL:
-        wait_time = MIN_REQUEST_INTERVAL - elapsed
-        time.sleep(wait_time)
+    if save_state:
+        save_request_state()
+
+    # レート制限（トークンバケットで平均間隔を確保）
+    rate_limiter.acquire()
 
     # タイムアウト設定
     if timeout is None:
         timeout = config.get('timeouts', {}).get('scraping', 10)
 
-    for attempt in range(max_retries):
-        try:
-            response = session.get(url, timeout=timeout)
-            last_request_time = time.time()
-            request_count += 1
+    try:
+        response = session.get(url, timeout=timeout)
+    except Exception as e:
+        print(f"[リクエストエラー] {e}")
+        return None
 
-            if response.status_code == 200:
-                return response
-            elif response.status_code == 404:
-                print(f"[404] ページが見つかりません: {url}")
-                return None
-            else:
-                print(f"[エラー] ステータスコード {response.status_code}: {url}")
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    print(f"  {wait_time}秒後にリトライ...")
-                    time.sleep(wait_time)
-        except Exception as e:
-            print(f"[リクエストエラー] {e}")
-            if attempt < max_retries - 1:
-                wait_time = 2 ** attempt
-                print(f"  {wait_time}秒後にリトライ...")
-                time.sleep(wait_time)
+    if response.status_code == 200:
+        return response
+    elif response.status_code == 404:
+        print(f"[404] ページが見つかりません: {url}")
+    else:
+        print(f"[エラー] ステータスコード {response.status_code}: {url}")
 
     return None
 
+def select_hrefs(html_content, selector, encoding=None):
+    """
+    HTMLからCSSセレクタに一致するリンクのhrefを取得
+
+    Args:
+        html_content: HTMLコンテンツ（bytes）
+        selector: CSSセレクタ
+        encoding: HTMLのエンコーディング（レスポンスヘッダーの値。BeautifulSoupでの文字コード推測を省く）
+
+    Returns:
+        list[str]: href属性のリスト
+    """
+    if HTMLParser is not None:
+        # hrefはASCIIのため、デコードせずにbytesのまま渡す
+        return [node.attributes.get('href') or '' for node in HTMLParser(html_content).css(selector)]
+
+    soup = BeautifulSoup(html_content, _BS4_PARSER, from_encoding=encoding)
+    return [a_tag.get('href', '') for a_tag in soup.select(selector)]
+
+def parse_race_id(href):
+    """
+    リンクのhrefからレースIDを取り出す
+
+    Args:
+        href: href属性（例: '../race/result.html?race_id=202405050811&rf=race_list'）
+
+    Returns:
+        str: レースID（見つからない場合はNone）
+    """
+    if 'race_id=' not in href:
+        return None
+    # 通常は文字列操作だけで取り出せる
+    race_id = href.partition('race_id=')[2].split('&', 1)[0]
+    if race_id.isdigit():
+        return race_id
+    match = _RACE_ID_RE.search(href)
+    return match.group(1) if match else None
+
+# レースID一覧のキャッシュ（開催日 -> (取得時刻, レースIDのリスト)）
+# 当日の一覧は更新されることがあるため、一定時間で取り直す
+RACE_IDS_CACHE_TTL = 300
+_race_ids_cache = {}
+
 def get_race_ids(kaisai_date):
     """
-    指定日のレースID一覧を取得
+    指定日のレースID一覧を取得（RACE_IDS_CACHE_TTL秒間キャッシュ）
+
+    Args:
+        kaisai_date: 開催日（例: '20241123'）
+
+    Returns:
+        list[str]: レースIDのリスト
+    """
+    cached = _race_ids_cache.get(kaisai_date)
+    if cached is not None and time.monotonic() - cached[0] < RACE_IDS_CACHE_TTL:
+        # 呼び出し側で書き換えてもキャッシュに影響しないようコピーを返す
+        return list(cached[1])
+
+    race_ids = fetch_race_ids(kaisai_date)
+    if race_ids:
+        # 取得失敗の可能性があるため空の結果はキャッシュしない
+        _race_ids_cache[kaisai_date] = (time.monotonic(), list(race_ids))
+    return race_ids
+
+def fetch_race_ids(kaisai_date):
+    """
+    指定日のレースID一覧をレース一覧ページから取得（キャッシュなし）
 
     Args:
         kaisai_date: 開催日（例: '20241123'）
@@ -178,19 +413,13 @@ def get_race_ids(kaisai_date):
         return []
 
     try:
-        try:
-            soup = BeautifulSoup(response.content, 'lxml')
-        except:
-            soup = BeautifulSoup(response.content, 'html.parser')
-
         race_ids = []
-        for a_tag in soup.select('li.RaceList_DataItem a[href*="/race/"]'):
-            href = a_tag.get('href', '')
-            match = re.search(r'race_id=(\d+)', href)
-            if match:
-                race_id = match.group(1)
-                if race_id not in race_ids:
-                    race_ids.append(race_id)
+        seen = set()
+        for href in select_hrefs(response.content, 'li.RaceList_DataItem a[href*="/race/"]', response.encoding):
+            race_id = parse_race_id(href)
+            if race_id and race_id not in seen:
+                seen.add(race_id)
+                race_ids.append(race_id)
 
         return race_ids
     except Exception as e:
@@ -217,26 +446,43 @@ def get_kaisai_dates(year, month):
         return []
     
     try:
-        try:
-            soup = BeautifulSoup(response.content, 'lxml')
-        except:
-            soup = BeautifulSoup(response.content, 'html.parser')
-        
-        kaisai_dates = []
+        # 最後にソートするため、重複除去はsetで行う
+        kaisai_dates = set()
         # カレンダーテーブルから開催日を抽出
-        for a_tag in soup.select('.Calendar_Table .Week > td > a'):
-            href = a_tag.get('href', '')
-            match = re.search(r'kaisai_date=(\d+)', href)
+        for href in select_hrefs(response.content, '.Calendar_Table .Week > td > a', response.encoding):
+            match = _KAISAI_RE.search(href)
             if match:
-                kaisai_date = match.group(1)
-                if kaisai_date not in kaisai_dates:
-                    kaisai_dates.append(kaisai_date)
+                kaisai_dates.add(match.group(1))
         
         return sorted(kaisai_dates)
     except Exception as e:
         print(f"開催日解析エラー ({year}-{month:02d}): {e}")
         return []
 
+# 開催日のキャッシュ（(年, 月) -> 開催日のset）
+_kaisai_cache = {}
+
+def get_kaisai_date_set(year, month):
+    """
+    指定年月のレース開催日をsetで取得（キャッシュ付き）
+    同じ月のカレンダーページを繰り返し取得しないよう、(年, 月)ごとに結果を保持する
+
+    Args:
+        year: 年（例: 2025）
+        month: 月（例: 11）
+
+    Returns:
+        set[str]: 開催日のset（例: {'20251101', '20251102', ...}）
+    """
+    key = (year, month)
+    if key not in _kaisai_cache:
+        kaisai_dates = get_kaisai_dates(year, month)
+        if not kaisai_dates:
+            # 取得失敗の可能性があるため空の結果はキャッシュしない
+            return set()
+        _kaisai_cache[key] = set(kaisai_dates)
+    return _kaisai_cache[key]
+
 def get_kaisai_dates_range(start_year, start_month, end_year, end_month):
     """
     指定期間のレース開催日を取得（複数月対応）
@@ -250,26 +496,28 @@ def get_kaisai_dates_range(start_year, start_month, end_year, end_month):
     Returns:
         list[str]: 開催日のリスト（ソート済み）
     """
-    all_dates = []
+    months = []
     current_year = start_year
     current_month = start_month
     
     while (current_year < end_year) or (current_year == end_year and current_month <= end_month):
         print(f"  カレンダー取得中: {current_year}年{current_month}月")
-        dates = get_kaisai_dates(current_year, current_month)
-        all_dates.extend(dates)
+        months.append((current_year, current_month))
         
         # 次の月へ
         current_month += 1
         if current_month > 12:
             current_month = 1
             current_year += 1
-        
-        # リクエスト間隔を確保
-        time.sleep(0.5)
     
-    # 重複を除去してソート
-    return sorted(list(set(all_dates)))
+    # 各月のカレンダーは独立しているため並列に取得（間隔はレート制限で確保）
+    all_dates = set()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for dates in executor.map(lambda ym: get_kaisai_date_set(*ym), months):
+            all_dates.update(dates)
+    
+    # ソートして返す
+    return sorted(all_dates)
 
 # データ保存ディレクトリ（参考ページの構造に合わせる）
 DATA_DIR = Path('data')
@@ -281,13 +529,108 @@ RESULT_HTML_DIR = HORSE_HTML_DIR / 'result'
 PED_HTML_DIR = HORSE_HTML_DIR / 'ped'
 LEADING_HTML_DIR = HTML_DIR / 'leading'
 
+# リクエスト状態の保存先（プロセスを再起動しても1日の上限を守るため）
+REQUEST_STATE_PATH = DATA_DIR / 'request_state.json'
+# レースごとの馬IDインデックスの保存先
+RACE_HORSE_INDEX_PATH = RAW_DATA_DIR / 'race_horse_index.json'
+
 # ディレクトリ作成
 for dir_path in [RAW_DATA_DIR, RACE_HTML_DIR, RESULT_HTML_DIR, PED_HTML_DIR, LEADING_HTML_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
+load_request_state()
+atexit.register(save_request_state)
+
+def html_file_path(html_dir, file_id):
+    """
+    保存先のHTMLファイルパスを取得（圧縮設定に応じて.binまたは.bin.gz）
+
+    Args:
+        html_dir: 保存ディレクトリ
+        file_id: レースID・馬IDなど
+
+    Returns:
+        Path: ファイルパス
+    """
+    suffix = '.bin.gz' if COMPRESS_HTML else '.bin'
+    return html_dir / f'{file_id}{suffix}'
+
+def find_html_file(html_dir, file_id):
+    """
+    保存済みのHTMLファイルを探す（.bin・.bin.gzのどちらでも可）
+
+    Args:
+        html_dir: 保存ディレクトリ
+        file_id: レースID・馬IDなど
+
+    Returns:
+        Path: ファイルパス（存在しない場合はNone）
+    """
+    for suffix in ('.bin', '.bin.gz'):
+        file_path = html_dir / f'{file_id}{suffix}'
+        if file_path.exists():
+            return file_path
+    return None
+
+# 取得済みIDのキャッシュ（ディレクトリ -> IDのset）
+_existing_ids = {}
+
+def scan_existing_ids(html_dir):
+    """
+    ディレクトリ内の保存済みHTMLファイルのIDを取得（1回のscandirでまとめて取得する）
+
+    Args:
+        html_dir: 保存ディレクトリ
+
+    Returns:
+        set[str]: 保存済みのID
+    """
+    ids = set()
+    with os.scandir(html_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith('.bin'):
+                ids.add(name[:-4])
+            elif name.endswith('.bin.gz'):
+                ids.add(name[:-7])
+    return ids
+
+def count_html_files(html_dir):
+    """ディレクトリ内の保存済みHTMLファイル数を取得（Pathオブジェクトを作らずに数える）"""
+    with os.scandir(html_dir) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(('.bin', '.bin.gz')))
+
+def refresh_existing_ids():
+    """取得済みIDのキャッシュを作り直す（スクレイピング開始時に呼ぶ）"""
+    for html_dir in (RACE_HTML_DIR, RESULT_HTML_DIR, PED_HTML_DIR):
+        _existing_ids[html_dir] = scan_existing_ids(html_dir)
+
+def is_scraped(html_dir, file_id):
+    """取得済みかどうかを判定（キャッシュがあればstatを発行しない）"""
+    existing = _existing_ids.get(html_dir)
+    if existing is None:
+        return find_html_file(html_dir, file_id) is not None
+    return file_id in existing
+
+def mark_scraped(html_dir, file_id):
+    """保存したIDを取得済みIDのキャッシュに追加"""
+    existing = _existing_ids.get(html_dir)
+    if existing is not None:
+        existing.add(file_id)
+
+def load_html(file_path):
+    """保存済みのHTMLコンテンツを読み込み（.bin.gzは展開する）"""
+    with open(file_path, 'rb') as f:
+        html_content = f.read()
+    if file_path.suffix == '.gz':
+        html_content = gzip.decompress(html_content)
+    return html_content
+
 def save_html(html_content, file_path):
-    """HTMLコンテンツをバイナリ形式で保存"""
+    """HTMLコンテンツをバイナリ形式で保存（.bin.gzの場合はgzip圧縮する）"""
     try:
+        if file_path.suffix == '.gz':
+            html_content = gzip.compress(html_content, compresslevel=6)
         with open(file_path, 'wb') as f:
             f.write(html_content)
         return True
@@ -295,9 +638,57 @@ def save_html(html_content, file_path):
         print(f"  [エラー] HTML保存エラー ({file_path.name}): {e}")
         return False
 
+# レースID -> 馬IDリストのインデックス（保存済みHTMLの再パースを避けるため）
+_race_horse_index = None
+_race_horse_index_lock = threading.Lock()
+
+def get_race_horse_index():
+    """レースごとの馬IDインデックスを取得（初回はファイルから読み込む）"""
+    global _race_horse_index
+    if _race_horse_index is None:
+        # レース結果は並列に取得するため、読み込みは1スレッドだけが行う
+        # （読み込み完了前に公開すると、その間に追加された分が読み込んだ辞書で上書きされて消える）
+        with _race_horse_index_lock:
+            if _race_horse_index is None:
+                index = {}
+                if RACE_HORSE_INDEX_PATH.exists():
+                    try:
+                        index = load_json(RACE_HORSE_INDEX_PATH)
+                    except Exception as e:
+                        print(f"[警告] 馬IDインデックスの読み込みエラー: {e}")
+                _race_horse_index = index
+    return _race_horse_index
+
+def save_race_horse_index():
+    """馬IDインデックスをファイルに保存"""
+    if _race_horse_index is None:
+        return
+    try:
+        with _race_horse_index_lock:
+            save_json(_race_horse_index, RACE_HORSE_INDEX_PATH)
+    except Exception as e:
+        print(f"[警告] 馬IDインデックスの保存エラー: {e}")
+
+atexit.register(save_race_horse_index)
+
+def parse_horse_ids(html_content):
+    """
+    レース結果ページのHTMLから馬IDを抽出
+    DOMは構築せず、href属性の /horse/{horse_id}/ を正規表現で直接拾う
+
+    Args:
+        html_content: HTMLコンテンツ（bytes）
+
+    Returns:
+        list[str]: 馬IDのリスト（ページ内の出現順）
+    """
+    # dict.fromkeysで出現順を保ったまま重複を除去
+    return [horse_id.decode('ascii') for horse_id in dict.fromkeys(_HORSE_HREF_RE.findall(html_content))]
+
 def scrape_race_result(race_id, verbose=True):
     """
     レース結果ページをスクレイピング
+    取得したHTMLからその場で馬IDを抽出し、インデックスに登録する
     
     Args:
         race_id: レースID
@@ -306,10 +697,8 @@ def scrape_race_result(race_id, verbose=True):
     Returns:
         tuple: (成功したかどうか, スキップしたかどうか)
     """
-    file_path = RACE_HTML_DIR / f'{race_id}.bin'
-    
     # 既に取得済みの場合はスキップ
-    if file_path.exists():
+    if is_scraped(RACE_HTML_DIR, race_id):
         if verbose:
             print(f"    [スキップ] レース結果は既に取得済み: {race_id}")
         return True, True  # (成功, スキップ)
@@ -320,12 +709,19 @@ def scrape_race_result(race_id, verbose=True):
     if not response:
         return False, False  # (失敗, スキップなし)
     
-    success = save_html(response.content, file_path)
+    success = save_html(response.content, html_file_path(RACE_HTML_DIR, race_id))
+    if success:
+        mark_scraped(RACE_HTML_DIR, race_id)
+        try:
+            get_race_horse_index()[race_id] = parse_horse_ids(response.content)
+        except Exception as e:
+            print(f"  [警告] 馬ID抽出エラー ({race_id}): {e}")
     return success, False  # (成功/失敗, スキップなし)
 
 def extract_horse_ids_from_race(race_id):
     """
     レース結果ページから馬IDを抽出
+    インデックスに登録済みであれば保存済みHTMLを読み込まない
     
     Args:
         race_id: レースID
@@ -333,31 +729,18 @@ def extract_horse_ids_from_race(race_id):
     Returns:
         list[str]: 馬IDのリスト
     """
-    file_path = RACE_HTML_DIR / f'{race_id}.bin'
+    index = get_race_horse_index()
+    if race_id in index:
+        return index[race_id]
+    
+    file_path = find_html_file(RACE_HTML_DIR, race_id)
     
-    if not file_path.exists():
+    if not file_path:
         return []
     
     try:
-        with open(file_path, 'rb') as f:
-            html_content = f.read()
-        
-        try:
-            soup = BeautifulSoup(html_content, 'lxml')
-        except:
-            soup = BeautifulSoup(html_content, 'html.parser')
-        
-        horse_ids = []
-        # レース結果テーブルから馬IDを抽出
-        for a_tag in soup.select('a[href*="/horse/"]'):
-            href = a_tag.get('href', '')
-            # /horse/{horse_id}/ のパターンを探す
-            match = re.search(r'/horse/(\d+)/', href)
-            if match:
-                horse_id = match.group(1)
-                if horse_id not in horse_ids:
-                    horse_ids.append(horse_id)
-        
+        horse_ids = parse_horse_ids(load_html(file_path))
+        index[race_id] = horse_ids
         return horse_ids
     except Exception as e:
         print(f"  [警告] 馬ID抽出エラー ({race_id}): {e}")
@@ -374,10 +757,8 @@ def scrape_horse_result(horse_id, verbose=False):
     Returns:
         tuple: (成功したかどうか, スキップしたかどうか)
     """
-    file_path = RESULT_HTML_DIR / f'{horse_id}.bin'
-    
     # 既に取得済みの場合はスキップ
-    if file_path.exists():
+    if is_scraped(RESULT_HTML_DIR, horse_id):
         return True, True  # (成功, スキップ)
     
     url = f'https://db.netkeiba.com/horse/result/{horse_id}/'
@@ -386,7 +767,9 @@ def scrape_horse_result(horse_id, verbose=False):
     if not response:
         return False, False  # (失敗, スキップなし)
     
-    success = save_html(response.content, file_path)
+    success = save_html(response.content, html_file_path(RESULT_HTML_DIR, horse_id))
+    if success:
+        mark_scraped(RESULT_HTML_DIR, horse_id)
     return success, False  # (成功/失敗, スキップなし)
 
 def scrape_horse_ped(horse_id, verbose=False):
@@ -400,10 +783,8 @@ def scrape_horse_ped(horse_id, verbose=False):
     Returns:
         tuple: (成功したかどうか, スキップしたかどうか)
     """
-    file_path = PED_HTML_DIR / f'{horse_id}.bin'
-    
     # 既に取得済みの場合はスキップ
-    if file_path.exists():
+    if is_scraped(PED_HTML_DIR, horse_id):
         return True, True  # (成功, スキップ)
     
     url = f'https://db.netkeiba.com/horse/ped/{horse_id}/'
@@ -412,9 +793,51 @@ def scrape_horse_ped(horse_id, verbose=False):
     if not response:
         return False, False  # (失敗, スキップなし)
     
-    success = save_html(response.content, file_path)
+    success = save_html(response.content, html_file_path(PED_HTML_DIR, horse_id))
+    if success:
+        mark_scraped(PED_HTML_DIR, horse_id)
     return success, False  # (成功/失敗, スキップなし)
 
+def scrape_horse_pages(horse_ids, scrape_peds=True):
+    """
+    複数の馬の結果ページ・血統ページを並列にスクレイピング
+
+    Args:
+        horse_ids: 馬IDのリスト
+        scrape_peds: 血統データも取得するか
+
+    Returns:
+        list[tuple]: 馬IDごとの (結果ページの結果, 血統ページの結果)
+                     各結果は (成功したかどうか, スキップしたかどうか)、血統を取得しない場合はNone
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # 結果ページと血統ページは別タスクとして投入し、同じ接続プール上で同時に取得する
+        result_futures = [executor.submit(scrape_horse_result, horse_id) for horse_id in horse_ids]
+        if scrape_peds:
+            ped_futures = [executor.submit(scrape_horse_ped, horse_id) for horse_id in horse_ids]
+        else:
+            ped_futures = [None] * len(horse_ids)
+        return [
+            (result_future.result(), ped_future.result() if ped_future is not None else None)
+            for result_future, ped_future in zip(result_futures, ped_futures)
+        ]
+
+def add_result_to_stats(stats, key, result):
+    """
+    スクレイピング結果を統計に加算
+
+    Args:
+        stats: 統計の辞書
+        key: 統計のキー（'races', 'horses', 'peds'）
+        result: (成功したかどうか, スキップしたかどうか)
+    """
+    success, skipped = result
+    if success:
+        if skipped:
+            stats[f'{key}_skipped'] += 1
+        else:
+            stats[f'{key}_success'] += 1
+
 def scrape_leading_pages():
     """
     リーディングページ（騎手、調教師、種牡馬）をスクレイピング
@@ -426,7 +849,7 @@ def scrape_leading_pages():
     }
     
     for leading_type, url in leading_types.items():
-        file_path = LEADING_HTML_DIR / f'{leading_type}.bin'
+        file_path = html_file_path(LEADING_HTML_DIR, leading_type)
         
         # リーディングは日次更新のため、毎日取得する（既存ファイルは上書き）
         response = safe_request(url)
@@ -436,10 +859,39 @@ def scrape_leading_pages():
         else:
             print(f"  [エラー] {leading_type}リーディング取得失敗")
 
+# 祝日の(月, 日)の一覧（簡易版：主要な祝日のみ）
+# 完全な判定には jpholiday などのライブラリが必要
+_HOLIDAYS = frozenset(
+    [
+        (1, 1),    # 元日
+        (2, 11),   # 建国記念の日
+        (2, 23),   # 天皇誕生日
+        (4, 29),   # 昭和の日
+        (5, 3),    # 憲法記念日
+        (5, 4),    # みどりの日
+        (5, 5),    # こどもの日
+        (8, 11),   # 山の日
+        (11, 3),   # 文化の日
+        (11, 23),  # 勤労感謝の日
+    ]
+    # 成人の日（1月第2月曜日）- 簡易版では1/8-1/14を祝日として扱う
+    + [(1, day) for day in range(8, 15)]
+    # 春分の日（簡易版：3/20-3/21）
+    + [(3, day) for day in range(20, 22)]
+    # 海の日（7月第3月曜日）- 簡易版では7/15-7/21を祝日として扱う
+    + [(7, day) for day in range(15, 22)]
+    # 敬老の日（9月第3月曜日）- 簡易版では9/15-9/21を祝日として扱う
+    + [(9, day) for day in range(15, 22)]
+    # 秋分の日（簡易版：9/22-9/23）
+    + [(9, day) for day in range(22, 24)]
+    # スポーツの日（10月第2月曜日）- 簡易版では10/8-10/14を祝日として扱う
+    + [(10, day) for day in range(8, 15)]
+)
+
 def is_holiday(date):
     """
-    祝日かどうかを簡易判定（日本の祝日）
-    注意: 完全な祝日判定にはholidaysライブラリが必要
+    祝日かどうかを判定（日本の祝日）
+    jpholidayがインストールされていればそれを使い、なければ簡易判定を行う
     
     Args:
         date: 日付（datetime.date）
@@ -447,61 +899,94 @@ def is_holiday(date):
     Returns:
         bool: 祝日の場合True
     """
-    # 簡易版：主要な祝日のみ判定
-    # 完全な判定には jpholiday などのライブラリが必要
-    month = date.month
-    day = date.day
-    
-    # 元日
-    if month == 1 and day == 1:
-        return True
-    # 成人の日（1月第2月曜日）- 簡易版では1/8-1/14を祝日として扱う
-    if month == 1 and 8 <= day <= 14:
-        return True
-    # 建国記念の日
-    if month == 2 and day == 11:
-        return True
-    # 春分の日（簡易版：3/20-3/21）
-    if month == 3 and 20 <= day <= 21:
-        return True
-    # 昭和の日
-    if month == 4 and day == 29:
-        return True
-    # 憲法記念日
-    if month == 5 and day == 3:
-        return True
-    # みどりの日
-    if month == 5 and day == 4:
-        return True
-    # こどもの日
-    if month == 5 and day == 5:
-        return True
-    # 海の日（7月第3月曜日）- 簡易版では7/15-7/21を祝日として扱う
-    if month == 7 and 15 <= day <= 21:
-        return True
-    # 山の日
-    if month == 8 and day == 11:
-        return True
-    # 敬老の日（9月第3月曜日）- 簡易版では9/15-9/21を祝日として扱う
-    if month == 9 and 15 <= day <= 21:
-        return True
-    # 秋分の日（簡易版：9/22-9/23）
-    if month == 9 and 22 <= day <= 23:
-        return True
-    # スポーツの日（10月第2月曜日）- 簡易版では10/8-10/14を祝日として扱う
-    if month == 10 and 8 <= day <= 14:
-        return True
-    # 文化の日
-    if month == 11 and day == 3:
-        return True
-    # 勤労感謝の日
-    if month == 11 and day == 23:
-        return True
-    # 天皇誕生日
-    if month == 2 and day == 23:
-        return True
-    
-    return False
+    if jpholiday is not None:
+        return jpholiday.is_holiday(date)
+    return (date.month, date.day) in _HOLIDAYS
+
+# 進捗表示の最短間隔（秒）。取得済みのレースが続くときに1件ずつ出力しないようにする
+PROGRESS_INTERVAL = 1.0
+
+def check_request_limit():
+    """
+    残りリクエスト数を確認し、少なくなっていれば警告を出す
+
+    Returns:
+        bool: 処理を続けてよいか（上限に達した場合はFalse）
+    """
+    status = get_request_status()
+    if status['remaining'] <= 5:
+        print(f"  [警告] 残りリクエスト数: {status['remaining']}回")
+        if status['remaining'] <= 0:
+            print("  [警告] 1日のリクエスト上限に達しました。処理を中断します。")
+            return False
+    return True
+
+def scrape_races_of_day(race_ids, stats, scrape_horses=True, scrape_peds=True):
+    """
+    1開催日分のレース結果と出走馬データをスクレイピング
+    同じ日に複数レースへ出走する馬がいるため、馬データは日単位で重複を除いてから取得する
+
+    Args:
+        race_ids: その日のレースIDのリスト
+        stats: 取得結果の統計（この関数内で更新する）
+        scrape_horses: 馬データも取得するか
+        scrape_peds: 血統データも取得するか
+
+    Returns:
+        bool: 処理を続けてよいか（リクエスト上限に達した場合はFalse）
+    """
+    # 出現順を保ったまま日単位で馬IDの重複を除く
+    day_horse_ids = {}
+    last_progress = 0.0
+
+    # レース結果は馬データと同じく並列に取得し（間隔はレート制限で確保）、結果はレース順に集計する
+    # （取得済みのレースは1件ずつ表示しない）
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        race_results = executor.map(partial(scrape_race_result, verbose=False), race_ids)
+        for i, (race_id, (race_success, race_skipped)) in enumerate(zip(race_ids, race_results), 1):
+            stats['races_processed'] += 1
+
+            if race_success:
+                if race_skipped:
+                    stats['races_skipped'] += 1
+                    result_label = 'スキップ'
+                else:
+                    stats['races_success'] += 1
+                    result_label = '完了'
+
+                if scrape_horses:
+                    day_horse_ids.update(dict.fromkeys(extract_horse_ids_from_race(race_id)))
+            else:
+                result_label = 'エラー'
+                # 失敗は間引かずに必ず表示する
+                print(f"    [エラー] レース結果取得失敗: {race_id}")
+
+            # 進捗はPROGRESS_INTERVAL秒に1回と最後のレースだけ表示する
+            now = time.monotonic()
+            if i == len(race_ids) or now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                print(f"  [{i}/{len(race_ids)}] レースID: {race_id} [{result_label}] (全体: {stats['races_processed']}レース目)")
+
+            # リクエスト状態を確認
+            if not check_request_limit():
+                return False
+
+    # 馬データを取得（その日の出走馬をまとめて1回ずつ）
+    if day_horse_ids:
+        horse_ids = list(day_horse_ids)
+        print(f"\n  → {len(horse_ids)}頭の馬データを取得中...")
+        for horse_result, ped_result in scrape_horse_pages(horse_ids, scrape_peds):
+            stats['horses_processed'] += 1
+            add_result_to_stats(stats, 'horses', horse_result)
+            if ped_result is not None:
+                stats['peds_processed'] += 1
+                add_result_to_stats(stats, 'peds', ped_result)
+        print(f"    馬データ取得完了: {len(horse_ids)}頭 (全体: {stats['horses_processed']}頭)")
+
+        if not check_request_limit():
+            return False
+
+    return True
 
 def scrape_date_range_from_calendar(start_year, start_month, end_year, end_month, scrape_horses=True, scrape_peds=True):
     """
@@ -550,6 +1035,9 @@ def scrape_date_range_from_calendar(start_year, start_month, end_year, end_month
     print(f"\n[見積もり] 処理時間: 約{estimated_time_minutes:.1f}分（レース: {estimated_races}件、馬: {estimated_horses}頭を想定）")
     print("  ※ リクエスト間隔（1.5秒）により時間がかかります")
     
+    # 取得済みファイルをまとめて確認（ファイルごとのstatを避ける）
+    refresh_existing_ids()
+    
     # 開催日を日付オブジェクトに変換
     dates = [datetime.strptime(d, '%Y%m%d').date() for d in kaisai_dates]
     start_date = min(dates)
@@ -609,62 +1097,9 @@ def scrape_date_range_from_calendar(start_year, start_month, end_year, end_month
         print(f"  [完了] {len(race_ids)}レースを発見")
         stats['dates_processed'] += 1
         
-        # 各レースを処理
-        for i, race_id in enumerate(race_ids, 1):
-            print(f"\n  [{i}/{len(race_ids)}] レースID: {race_id} (全体: {stats['races_processed'] + 1}レース目)")
-            stats['races_processed'] += 1
-            
-            # レース結果を取得
-            race_success, race_skipped = scrape_race_result(race_id)
-            if race_success:
-                if race_skipped:
-                    stats['races_skipped'] += 1
-                    print(f"    [スキップ] 既に取得済み")
-                else:
-                    stats['races_success'] += 1
-                    print(f"    [完了] レース結果取得完了")
-                
-                # 馬データを取得
-                if scrape_horses:
-                    horse_ids = extract_horse_ids_from_race(race_id)
-                    if horse_ids:
-                        print(f"    → {len(horse_ids)}頭の馬データを取得中...")
-                        for j, horse_id in enumerate(horse_ids, 1):
-                            if j % 5 == 0 or j == len(horse_ids):
-                                print(f"      馬データ取得進捗: {j}/{len(horse_ids)}頭 (全体: {stats['horses_processed'] + 1}頭目)")
-                            stats['horses_processed'] += 1
-                            horse_success, horse_skipped = scrape_horse_result(horse_id)
-                            if horse_success:
-                                if horse_skipped:
-                                    stats['horses_skipped'] += 1
-                                else:
-                                    stats['horses_success'] += 1
-                            
-                            # 血統データを取得
-                            if scrape_peds:
-                                stats['peds_processed'] += 1
-                                ped_success, ped_skipped = scrape_horse_ped(horse_id)
-                                if ped_success:
-                                    if ped_skipped:
-                                        stats['peds_skipped'] += 1
-                                    else:
-                                        stats['peds_success'] += 1
-                            
-                            # リクエスト間隔を確保
-                            time.sleep(0.3)
-            else:
-                print(f"    [エラー] レース結果取得失敗")
-            
-            # リクエスト状態を確認
-            status = get_request_status()
-            if status['remaining'] <= 5:
-                print(f"  [警告] 残りリクエスト数: {status['remaining']}回")
-                if status['remaining'] <= 0:
-                    print("  [警告] 1日のリクエスト上限に達しました。処理を中断します。")
-                    return stats
-            
-            # リクエスト間隔を確保
-            time.sleep(0.5)
+        # 各レースと出走馬を処理
+        if not scrape_races_of_day(race_ids, stats, scrape_horses, scrape_peds):
+            return stats
     
     return stats
 
@@ -695,6 +1130,9 @@ def scrape_date_range(start_date, end_date, scrape_horses=True, scrape_peds=True
         'peds_skipped': 0,
     }
     
+    # 取得済みファイルをまとめて確認（ファイルごとのstatを避ける）
+    refresh_existing_ids()
+    
     today = datetime.now().date()
     current_date = start_date
     
@@ -726,7 +1164,7 @@ def scrape_date_range(start_date, end_date, scrape_horses=True, scrape_peds=True
         # 開催カレンダーから実際の開催日を確認
         year = current_date.year
         month = current_date.month
-        kaisai_dates_in_month = get_kaisai_dates(year, month)
+        kaisai_dates_in_month = get_kaisai_date_set(year, month)
         kaisai_date = current_date.strftime('%Y%m%d')
 
         # 開催日でない場合はスキップ
@@ -746,59 +1184,9 @@ def scrape_date_range(start_date, end_date, scrape_horses=True, scrape_peds=True
         print(f"  [完了] {len(race_ids)}レースを発見")
         stats['dates_processed'] += 1
         
-        # 各レースを処理
-        for i, race_id in enumerate(race_ids, 1):
-            print(f"\n  [{i}/{len(race_ids)}] レースID: {race_id}")
-            stats['races_processed'] += 1
-            
-            # レース結果を取得
-            race_success, race_skipped = scrape_race_result(race_id)
-            if race_success:
-                if race_skipped:
-                    stats['races_skipped'] += 1
-                else:
-                    stats['races_success'] += 1
-                    print(f"    [完了] レース結果取得完了")
-                
-                # 馬データを取得
-                if scrape_horses:
-                    horse_ids = extract_horse_ids_from_race(race_id)
-                    if horse_ids:
-                        print(f"    → {len(horse_ids)}頭の馬データを取得中...")
-                        for horse_id in horse_ids:
-                            stats['horses_processed'] += 1
-                            horse_success, horse_skipped = scrape_horse_result(horse_id)
-                            if horse_success:
-                                if horse_skipped:
-                                    stats['horses_skipped'] += 1
-                                else:
-                                    stats['horses_success'] += 1
-                            
-                            # 血統データを取得
-                            if scrape_peds:
-                                stats['peds_processed'] += 1
-                                ped_success, ped_skipped = scrape_horse_ped(horse_id)
-                                if ped_success:
-                                    if ped_skipped:
-                                        stats['peds_skipped'] += 1
-                                    else:
-                                        stats['peds_success'] += 1
-                            
-                            # リクエスト間隔を確保
-                            time.sleep(0.3)
-            else:
-                print(f"    [エラー] レース結果取得失敗")
-            
-            # リクエスト状態を確認
-            status = get_request_status()
-            if status['remaining'] <= 5:
-                print(f"  [警告] 残りリクエスト数: {status['remaining']}回")
-                if status['remaining'] <= 0:
-                    print("  [警告] 1日のリクエスト上限に達しました。処理を中断します。")
-                    return stats
-            
-            # リクエスト間隔を確保
-            time.sleep(0.5)
+        # 各レースと出走馬を処理
+        if not scrape_races_of_day(race_ids, stats, scrape_horses, scrape_peds):
+            return stats
         
         current_date += timedelta(days=1)
     
@@ -819,23 +1207,24 @@ def find_recent_race_dates(days_back=30, min_races=1, include_weekend=True):
     today = datetime.now().date()
     found_dates = []
     
-    for i in range(days_back):
-        check_date = today - timedelta(days=i)
-        # 今日はスキップ（当日レース情報取得に注力するため）
-        if check_date == today:
-            continue
-        
-        kaisai_date = check_date.strftime('%Y%m%d')
-        race_ids = get_race_ids(kaisai_date)
-        
-        if race_ids and len(race_ids) >= min_races:
-            found_dates.append({
-                'date': check_date,
-                'kaisai_date': kaisai_date,
-                'race_count': len(race_ids)
-            })
-            if len(found_dates) >= 5:  # 5件見つかったら終了
-                break
+    # 今日はスキップ（当日レース情報取得に注力するため）
+    check_dates = [today - timedelta(days=i) for i in range(1, days_back)]
+    
+    # 新しい日付からMAX_WORKERS日分ずつ並列に取得（間隔はレート制限で確保）
+    # 5件見つかった時点で打ち切るため、余分なリクエストは最大でも1バッチ分
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for start in range(0, len(check_dates), MAX_WORKERS):
+            batch = check_dates[start:start + MAX_WORKERS]
+            kaisai_dates = [check_date.strftime('%Y%m%d') for check_date in batch]
+            for check_date, kaisai_date, race_ids in zip(batch, kaisai_dates, executor.map(get_race_ids, kaisai_dates)):
+                if race_ids and len(race_ids) >= min_races:
+                    found_dates.append({
+                        'date': check_date,
+                        'kaisai_date': kaisai_date,
+                        'race_count': len(race_ids)
+                    })
+                    if len(found_dates) >= 5:  # 5件見つかったら終了
+                        return found_dates
     
     return found_dates
 
@@ -944,6 +1333,6 @@ if __name__ == '__main__':
     
     # 取得したファイル数の確認
     print(f"\n取得したファイル数:")
-    print(f"  レース結果: {len(list(RACE_HTML_DIR.glob('*.bin')))}")
-    print(f"  馬結果: {len(list(RESULT_HTML_DIR.glob('*.bin')))}")
-    print(f"  血統: {len(list(PED_HTML_DIR.glob('*.bin')))}")
+    print(f"  レース結果: {count_html_files(RACE_HTML_DIR)}")
+    print(f"  馬結果: {count_html_files(RESULT_HTML_DIR)}")
+    print(f"  血統: {count_html_files(PED_HTML_DIR)}")
@@ -2,23 +2,37 @@
 過去データスクレイピング - コマンドラインインターフェース
 日付範囲を柔軟に指定できるようにする
 """
-import argparse
 import sys
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 import os
+import re
+from functools import lru_cache
 
-# appディレクトリをパスに追加
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# スクリプトとして直接実行された場合のみ、appディレクトリの親をパスに追加
+# （python -m app.data_scraper_cli やimportされた場合はappを解決できるので不要）
+if not __package__:
+    _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _project_root not in sys.path:
+        sys.path.insert(0, _project_root)
 
-from app.data_scraper import (
-    scrape_date_range_from_calendar,
-    scrape_date_range,
-    scrape_date_range_from_config,
-    scrape_last_week,
-    get_request_status
+# 相対日付のキーワード -> 今日から遡る日数
+_RELATIVE = {
+    'today': 0,
+    'yesterday': 1,
+    'last_week': 7,
+    'last_month': 30,
+}
+
+# -Ndays/+Ndays, YYYY-MM-DD, YYYYMMDD をまとめて判定する正規表現
+_DATE_RE = re.compile(
+    r'(?P<days>[+-]?\d+)days'
+    r'|(?P<iso_y>\d{4})-(?P<iso_m>\d{2})-(?P<iso_d>\d{2})'
+    r'|(?P<y>\d{4})(?P<m>\d{2})(?P<d>\d{2})'
 )
 
+# YYYY-MM, YYYY/MM, YYYYMM をまとめて判定する正規表現
+_MONTH_RE = re.compile(r'(?P<y>\d{4})[-/]?(?P<m>\d{2})')
+
 def parse_date(date_str):
     """
     日付文字列を解析
@@ -35,51 +49,45 @@ def parse_date(date_str):
     Returns:
         datetime.date: 日付オブジェクト
     """
-    today = datetime.now().date()
+    # 相対日付は今日の日付に依存するため、今日の日付もキャッシュのキーに含める
+    return _parse_date_cached(date_str, date.today())
+
+@lru_cache(maxsize=128)
+def _parse_date_cached(date_str, today):
+    """
+    parse_dateの本体（同じ文字列・同じ日付の組み合わせは結果を再利用する）
     
-    # 相対日付の処理
-    if date_str == 'today':
-        return today
-    elif date_str == 'yesterday':
-        return today - timedelta(days=1)
-    elif date_str == 'last_week':
-        return today - timedelta(days=7)
-    elif date_str == 'last_month':
-        return today - timedelta(days=30)
-    elif date_str.endswith('days'):
-        # -Ndays または +Ndays形式
-        try:
-            # 'days'を除いた部分を取得
-            number_part = date_str[:-4]  # 'days'の4文字を除く
-            if number_part.startswith('-'):
-                days = int(number_part[1:])  # '-'を除いた数字部分
-                return today - timedelta(days=days)
-            elif number_part.startswith('+'):
-                days = int(number_part[1:])  # '+'を除いた数字部分
-                return today + timedelta(days=days)
-            else:
-                # 符号がない場合は正の数として扱う
-                days = int(number_part)
-                return today + timedelta(days=days)
-        except ValueError:
-            raise ValueError(f"無効な日付形式: {date_str}")
+    Args:
+        date_str: 日付文字列
+        today: 今日の日付
     
-    # YYYY-MM-DD形式
-    if len(date_str) == 10 and date_str.count('-') == 2:
-        try:
-            return datetime.strptime(date_str, '%Y-%m-%d').date()
-        except ValueError:
-            raise ValueError(f"無効な日付形式: {date_str}")
+    Returns:
+        datetime.date: 日付オブジェクト
+    """
+    # 相対日付の処理
+    if date_str in _RELATIVE:
+        return today - timedelta(days=_RELATIVE[date_str])
     
-    # YYYYMMDD形式
-    if len(date_str) == 8 and date_str.isdigit():
-        try:
-            return datetime.strptime(date_str, '%Y%m%d').date()
-        except ValueError:
-            raise ValueError(f"無効な日付形式: {date_str}")
+    match = _DATE_RE.fullmatch(date_str)
+    if not match:
+        raise ValueError(f"無効な日付形式: {date_str}")
     
-    raise ValueError(f"無効な日付形式: {date_str}")
+    try:
+        days = match.group('days')
+        if days is not None:
+            # -Ndays または +Ndays形式（int()が符号をそのまま解釈する。符号なしは未来）
+            return today + timedelta(days=int(days))
+        
+        # YYYY-MM-DD形式
+        if match.group('iso_y') is not None:
+            return date(int(match.group('iso_y')), int(match.group('iso_m')), int(match.group('iso_d')))
+        
+        # YYYYMMDD形式
+        return date(int(match.group('y')), int(match.group('m')), int(match.group('d')))
+    except (ValueError, OverflowError):
+        raise ValueError(f"無効な日付形式: {date_str}")
 
+@lru_cache(maxsize=128)
 def parse_month(month_str):
     """
     月指定文字列を解析
@@ -95,34 +103,131 @@ def parse_month(month_str):
     Returns:
         tuple: (year, month)
     """
-    # YYYY-MM形式
-    if len(month_str) == 7 and month_str.count('-') == 1:
-        try:
-            year, month = month_str.split('-')
-            return int(year), int(month)
-        except ValueError:
-            raise ValueError(f"無効な月形式: {month_str}")
+    # 符号・空白・_はint()が受け付けてしまうため、数字だけで構成されているかを正規表現で確認する
+    match = _MONTH_RE.fullmatch(month_str)
+    if not match:
+        raise ValueError(f"無効な月形式: {month_str}")
     
-    # YYYY/MM形式
-    if len(month_str) == 7 and month_str.count('/') == 1:
-        try:
-            year, month = month_str.split('/')
-            return int(year), int(month)
-        except ValueError:
-            raise ValueError(f"無効な月形式: {month_str}")
+    year = int(match.group('y'))
+    month = int(match.group('m'))
+    if not 1 <= month <= 12:
+        raise ValueError(f"無効な月形式: {month_str}")
+    return year, month
+
+def _parse_date_range(start_str, end_str):
+    """
+    開始日・終了日の文字列を解析し、前後関係を確認する
     
-    # YYYYMM形式
-    if len(month_str) == 6 and month_str.isdigit():
-        try:
-            year = int(month_str[:4])
-            month = int(month_str[4:6])
-            return year, month
-        except ValueError:
-            raise ValueError(f"無効な月形式: {month_str}")
+    Args:
+        start_str: 開始日の文字列
+        end_str: 終了日の文字列
     
-    raise ValueError(f"無効な月形式: {month_str}")
+    Returns:
+        tuple: (開始日, 終了日)
+    """
+    # 前後関係は両方の日付が正しく解析できてから確認する（無効な日付は形式エラーとして扱う）
+    start_date = parse_date(start_str)
+    end_date = parse_date(end_str)
+    if start_date > end_date:
+        raise ValueError(f"開始日が終了日より後です: {start_date} > {end_date}")
+    return start_date, end_date
+
+def handle_config(args, env, scrape_horses, scrape_peds, skip_today):
+    """config.jsonの設定でスクレイピング"""
+    from app.data_scraper import scrape_date_range_from_config
+    print("\n[設定] config.jsonの設定を使用します")
+    return scrape_date_range_from_config()
+
+def handle_last_week(args, env, scrape_horses, scrape_peds, skip_today):
+    """先週のデータをスクレイピング"""
+    from app.data_scraper import scrape_last_week
+    print("\n[設定] 先週のデータを取得します")
+    return scrape_last_week()
+
+def handle_month_range(args, env, scrape_horses, scrape_peds, skip_today):
+    """年月範囲指定（カレンダー方式）でスクレイピング"""
+    from app.data_scraper import scrape_date_range_from_calendar
+    start_year, start_month = parse_month(args.start_month)
+    end_year, end_month = parse_month(args.end_month)
+    print(f"\n[設定] カレンダー方式: {start_year}年{start_month}月 ～ {end_year}年{end_month}月")
+    return scrape_date_range_from_calendar(
+        start_year, start_month,
+        end_year, end_month,
+        scrape_horses=scrape_horses,
+        scrape_peds=scrape_peds
+    )
+
+def handle_year_month_nums(args, env, scrape_horses, scrape_peds, skip_today):
+    """年月個別指定（カレンダー方式）でスクレイピング"""
+    from app.data_scraper import scrape_date_range_from_calendar
+    print(f"\n[設定] カレンダー方式: {args.start_year}年{args.start_month_num}月 ～ {args.end_year}年{args.end_month_num}月")
+    return scrape_date_range_from_calendar(
+        args.start_year, args.start_month_num,
+        args.end_year, args.end_month_num,
+        scrape_horses=scrape_horses,
+        scrape_peds=scrape_peds
+    )
+
+def handle_date_range(args, env, scrape_horses, scrape_peds, skip_today):
+    """日付範囲指定でスクレイピング"""
+    from app.data_scraper import scrape_date_range
+    start_date, end_date = _parse_date_range(args.start_date, args.end_date)
+    print(f"\n[設定] 日付範囲: {start_date} ～ {end_date}")
+    return scrape_date_range(
+        start_date, end_date,
+        scrape_horses=scrape_horses,
+        scrape_peds=scrape_peds,
+        skip_today=skip_today
+    )
+
+def handle_env_date_range(args, env, scrape_horses, scrape_peds, skip_today):
+    """環境変数の日付範囲でスクレイピング"""
+    from app.data_scraper import scrape_date_range
+    start_date, end_date = _parse_date_range(env['start_date'], env['end_date'])
+    print(f"\n[設定] 環境変数から取得: {start_date} ～ {end_date}")
+    return scrape_date_range(
+        start_date, end_date,
+        scrape_horses=scrape_horses,
+        scrape_peds=scrape_peds,
+        skip_today=skip_today
+    )
 
-def main():
+def handle_env_month_range(args, env, scrape_horses, scrape_peds, skip_today):
+    """環境変数の年月範囲（カレンダー方式）でスクレイピング"""
+    from app.data_scraper import scrape_date_range_from_calendar
+    start_year, start_month = parse_month(env['start_month'])
+    end_year, end_month = parse_month(env['end_month'])
+    print(f"\n[設定] 環境変数から取得（カレンダー方式）: {start_year}年{start_month}月 ～ {end_year}年{end_month}月")
+    return scrape_date_range_from_calendar(
+        start_year, start_month,
+        end_year, end_month,
+        scrape_horses=scrape_horses,
+        scrape_peds=scrape_peds
+    )
+
+# (必要な値のキー, 処理) の組。上にあるものほど優先され、キーの値がすべて指定されていれば実行する
+# env_ で始まるキーは環境変数の値
+DISPATCH = [
+    (('use_config',), handle_config),
+    (('last_week',), handle_last_week),
+    (('start_month', 'end_month'), handle_month_range),
+    (('start_year', 'start_month_num', 'end_year', 'end_month_num'), handle_year_month_nums),
+    (('start_date', 'end_date'), handle_date_range),
+    (('env_start_date', 'env_end_date'), handle_env_date_range),
+    (('env_start_month', 'env_end_month'), handle_env_month_range),
+]
+
+@lru_cache(maxsize=1)
+def _build_parser():
+    """
+    コマンドライン引数のパーサーを作成（一度作成したものを使い回す）
+    
+    Returns:
+        argparse.ArgumentParser: 引数パーサー
+    """
+    # argparseの読み込み自体にも時間がかかるため、必要になってから読み込む
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='過去データスクレイピング - 日付範囲を柔軟に指定',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -228,146 +333,106 @@ def main():
         help='先週のデータを取得（テスト用）'
     )
     
-    args = parser.parse_args()
+    return parser
+
+def main(argv=None):
+    """
+    CLIのエントリポイント
+
+    Args:
+        argv: コマンドライン引数（Noneの場合はsys.argv[1:]）。他のスクリプトから直接呼び出すときに指定する
+
+    Returns:
+        int: 終了コード（0=成功、1=失敗）
+    """
+    args = _build_parser().parse_args(argv)
+    
+    # スクレイピング本体（HTTP・HTML解析周り）の読み込みは引数の解析後に行う
+    # （--helpや引数エラーの場合は読み込まずに終了する）
+    from app.data_scraper import scrape_date_range_from_config, get_request_status
     
     # リクエスト状態を確認
     status = get_request_status()
-    print("="*80)
-    print("過去データスクレイピング開始")
-    print("="*80)
-    print(f"\n現在のリクエスト状態:")
-    print(f"  使用済み: {status['count']}回")
-    print(f"  残り: {status['remaining']}回")
-    if 'type' in status:
-        print(f"  日付タイプ: {status['type']}")
+    date_type_line = f"  日付タイプ: {status['type']}\n" if 'type' in status else ""
+    sys.stdout.write(
+        f"{'='*80}\n"
+        f"過去データスクレイピング開始\n"
+        f"{'='*80}\n"
+        f"\n現在のリクエスト状態:\n"
+        f"  使用済み: {status['count']}回\n"
+        f"  残り: {status['remaining']}回\n"
+        f"{date_type_line}"
+    )
     
     if status['remaining'] <= 0:
         print("\n[警告] 1日のリクエスト上限に達しています。処理を中断します。")
-        sys.exit(1)
+        return 1
     
-    print("\n[注意] スクレイピングには時間がかかります:")
-    print("  - 各リクエスト間に1.5秒の待機時間があります（スクレイピング対策）")
-    print("  - 10月・11月のデータ取得には数時間かかる可能性があります")
-    print("  - 進捗状況は随時表示されます")
+    sys.stdout.write(
+        "\n[注意] スクレイピングには時間がかかります:\n"
+        "  - 各リクエスト間に1.5秒の待機時間があります（スクレイピング対策）\n"
+        "  - 10月・11月のデータ取得には数時間かかる可能性があります\n"
+        "  - 進捗状況は随時表示されます\n"
+    )
     
     # オプションの処理
     scrape_horses = not args.no_horses
     scrape_peds = not args.no_peds
     skip_today = not args.include_today
     
-    # config.jsonを優先する場合
-    if args.use_config:
-        print("\n[設定] config.jsonの設定を使用します")
-        stats = scrape_date_range_from_config()
-    # 先週のデータを取得
-    elif args.last_week:
-        print("\n[設定] 先週のデータを取得します")
-        stats = scrape_last_week()
-    # 年月範囲指定（カレンダー方式）
-    elif args.start_month and args.end_month:
-        try:
-            start_year, start_month = parse_month(args.start_month)
-            end_year, end_month = parse_month(args.end_month)
-            print(f"\n[設定] カレンダー方式: {start_year}年{start_month}月 ～ {end_year}年{end_month}月")
-            stats = scrape_date_range_from_calendar(
-                start_year, start_month,
-                end_year, end_month,
-                scrape_horses=scrape_horses,
-                scrape_peds=scrape_peds
-            )
-        except ValueError as e:
-            print(f"\n[エラー] {e}")
-            sys.exit(1)
-    # 年月個別指定（カレンダー方式）
-    elif args.start_year and args.start_month_num and args.end_year and args.end_month_num:
-        print(f"\n[設定] カレンダー方式: {args.start_year}年{args.start_month_num}月 ～ {args.end_year}年{args.end_month_num}月")
-        stats = scrape_date_range_from_calendar(
-            args.start_year, args.start_month_num,
-            args.end_year, args.end_month_num,
-            scrape_horses=scrape_horses,
-            scrape_peds=scrape_peds
-        )
-    # 日付範囲指定
-    elif args.start_date and args.end_date:
-        try:
-            start_date = parse_date(args.start_date)
-            end_date = parse_date(args.end_date)
-            
-            if start_date > end_date:
-                print(f"\n[エラー] 開始日が終了日より後です: {start_date} > {end_date}")
-                sys.exit(1)
-            
-            print(f"\n[設定] 日付範囲: {start_date} ～ {end_date}")
-            stats = scrape_date_range(
-                start_date, end_date,
-                scrape_horses=scrape_horses,
-                scrape_peds=scrape_peds,
-                skip_today=skip_today
-            )
-        except ValueError as e:
-            print(f"\n[エラー] {e}")
-            sys.exit(1)
-    # 環境変数から取得
-    elif os.getenv('SCRAPER_START_DATE') and os.getenv('SCRAPER_END_DATE'):
-        try:
-            start_date = parse_date(os.getenv('SCRAPER_START_DATE'))
-            end_date = parse_date(os.getenv('SCRAPER_END_DATE'))
-            
-            if start_date > end_date:
-                print(f"\n[エラー] 開始日が終了日より後です: {start_date} > {end_date}")
-                sys.exit(1)
-            
-            print(f"\n[設定] 環境変数から取得: {start_date} ～ {end_date}")
-            stats = scrape_date_range(
-                start_date, end_date,
-                scrape_horses=scrape_horses,
-                scrape_peds=scrape_peds,
-                skip_today=skip_today
-            )
-        except ValueError as e:
-            print(f"\n[エラー] {e}")
-            sys.exit(1)
-    # 環境変数から年月取得
-    elif os.getenv('SCRAPER_START_MONTH') and os.getenv('SCRAPER_END_MONTH'):
-        try:
-            start_year, start_month = parse_month(os.getenv('SCRAPER_START_MONTH'))
-            end_year, end_month = parse_month(os.getenv('SCRAPER_END_MONTH'))
-            print(f"\n[設定] 環境変数から取得（カレンダー方式）: {start_year}年{start_month}月 ～ {end_year}年{end_month}月")
-            stats = scrape_date_range_from_calendar(
-                start_year, start_month,
-                end_year, end_month,
-                scrape_horses=scrape_horses,
-                scrape_peds=scrape_peds
-            )
-        except ValueError as e:
-            print(f"\n[エラー] {e}")
-            sys.exit(1)
-    # デフォルト: config.jsonから取得
+    # 環境変数は一度だけ読み込む
+    env = {
+        'start_date': os.getenv('SCRAPER_START_DATE'),
+        'end_date': os.getenv('SCRAPER_END_DATE'),
+        'start_month': os.getenv('SCRAPER_START_MONTH'),
+        'end_month': os.getenv('SCRAPER_END_MONTH'),
+    }
+    
+    # 上から順に条件を確認し、最初に一致した方法でスクレイピングする
+    # 引数と環境変数の値は一度だけまとめて取り出し、条件判定ではそれを参照する
+    values = vars(args).copy()
+    for key, value in env.items():
+        values[f'env_{key}'] = value
+    
+    for required_keys, handler in DISPATCH:
+        if all(values[key] for key in required_keys):
+            try:
+                stats = handler(args, env, scrape_horses, scrape_peds, skip_today)
+            except ValueError as e:
+                print(f"\n[エラー] {e}")
+                return 1
+            break
     else:
+        # デフォルト: config.jsonから取得
         print("\n[設定] 引数が指定されていません。config.jsonの設定を使用します")
         stats = scrape_date_range_from_config()
     
     # 結果表示
-    print("\n" + "="*80)
-    print("スクレイピング結果")
-    print("="*80)
-    print(f"処理した日数: {stats['dates_processed']}")
-    print(f"処理したレース数: {stats['races_processed']}")
-    print(f"成功したレース数: {stats['races_success']}")
-    print(f"スキップしたレース数: {stats['races_skipped']}")
-    print(f"処理した馬数: {stats['horses_processed']}")
-    print(f"成功した馬数: {stats['horses_success']}")
-    print(f"スキップした馬数: {stats['horses_skipped']}")
-    print(f"処理した血統数: {stats['peds_processed']}")
-    print(f"成功した血統数: {stats['peds_success']}")
-    print(f"スキップした血統数: {stats['peds_skipped']}")
+    sys.stdout.write(
+        f"\n{'='*80}\n"
+        f"スクレイピング結果\n"
+        f"{'='*80}\n"
+        f"処理した日数: {stats['dates_processed']}\n"
+        f"処理したレース数: {stats['races_processed']}\n"
+        f"成功したレース数: {stats['races_success']}\n"
+        f"スキップしたレース数: {stats['races_skipped']}\n"
+        f"処理した馬数: {stats['horses_processed']}\n"
+        f"成功した馬数: {stats['horses_success']}\n"
+        f"スキップした馬数: {stats['horses_skipped']}\n"
+        f"処理した血統数: {stats['peds_processed']}\n"
+        f"成功した血統数: {stats['peds_success']}\n"
+        f"スキップした血統数: {stats['peds_skipped']}\n"
+    )
     
     # 最終的なリクエスト状態
     final_status = get_request_status()
-    print(f"\n最終リクエスト状態:")
-    print(f"  使用済み: {final_status['count']}回")
-    print(f"  残り: {final_status['remaining']}回")
+    sys.stdout.write(
+        f"\n最終リクエスト状態:\n"
+        f"  使用済み: {final_status['count']}回\n"
+        f"  残り: {final_status['remaining']}回\n"
+    )
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
 
@@ -3,10 +3,446 @@ HTMLパーサー - レースHTMLから特徴量を抽出
 
 data/html/race/*.binファイルから馬情報とレース情報を抽出
 """
+import copy
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from bs4 import BeautifulSoup
+from typing import Any, Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
+import gzip
+import logging
+import os
 import re
+import threading
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    # 未インストールの場合はBeautifulSoupでパースする
+    HTMLParser = None
+
+try:
+    from app.utils.request_manager import make_request
+except ImportError:
+    # request_managerがない環境でもHTMLのパース自体は使えるようにする（オッズは取得しない）
+    make_request = None
+
+# 警告・エラーはloggingで出す（大量パース時はレベルを上げて抑止できる）
+logger = logging.getLogger(__name__)
+
+# ===== 解析用の正規表現（モジュール読み込み時に一度だけコンパイル） =====
+_RE_DIST = re.compile(r'([芝ダ障])(\d+)m')
+_RE_WEATHER = re.compile(r'天候\s*:\s*(\S+)')
+_RE_COND = re.compile(r'馬場\s*:\s*(\S+)')
+_RE_TRAINER = re.compile(r'\[.\](.+)')
+_RE_NUM_HEAD = re.compile(r'(\d+)頭')
+
+# レース記号（RaceData02のspanに出てくるもの）
+_RACE_SYMBOLS = frozenset(['牝', '牡', '混', 'ハンデ', '定量', '別定', '馬齢',
+                           '見習騎手', 'せん', '国際', '指定', '特指', '抽選'])
+
+# レース名に含まれるグレード表記（上から順に判定する）
+_GRADE_MARKERS = (
+    ('G1', ('G1', 'GI')),
+    ('G2', ('G2', 'GII')),
+    ('G3', ('G3', 'GIII')),
+)
+
+# 回り方向の表記（半角・全角の括弧）-> 方向（上から順に判定する）
+_DIRECTION_MARKERS = {
+    '(右)': '右', '（右）': '右',
+    '(左)': '左', '（左）': '左',
+    '(直線)': '直線', '（直線）': '直線',
+}
+
+
+class _SoupNode:
+    """BeautifulSoupのタグをselectolaxのNodeと同じ呼び方（css_first/css/text）で扱う薄いラッパー"""
+
+    __slots__ = ('_tag',)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def css_first(self, selector: str) -> Optional['_SoupNode']:
+        tag = self._tag.select_one(selector)
+        return _SoupNode(tag) if tag is not None else None
+
+    def css(self, selector: str) -> List['_SoupNode']:
+        return [_SoupNode(tag) for tag in self._tag.select(selector)]
+
+    def text(self, strip: bool = False) -> str:
+        return self._tag.get_text(strip=strip)
+
+
+# BeautifulSoupでパースする場合に残す要素のクラス（これ以外の要素はツリーを作らない）
+_STRAINER_CLASSES = frozenset([
+    'RaceName', 'RaceData01', 'RaceData02',  # レース情報
+    'race_table_01', 'Shutuba_Table', 'RaceTable01',  # 結果・出馬表テーブル
+    'Odds_Table',  # オッズテーブル
+])
+
+
+def _is_target_element(name: str, attrs: Any) -> bool:
+    """
+    パース中の要素を残すか（_STRAINER_CLASSESのクラスを持つ要素か、クラスのない出馬表テーブル）
+
+    Args:
+        name: タグ名
+        attrs: 属性（classは分割前の文字列、またはリストで渡される）
+    """
+    if not attrs:
+        return False
+    value = attrs.get('class')
+    if value:
+        classes = value.split() if isinstance(value, str) else value
+        if any(c in _STRAINER_CLASSES for c in classes):
+            return True
+    # 別パターンの出馬表（table[summary="出馬表"]）はクラスを持たない
+    return name == 'table' and attrs.get('summary') == '出馬表'
+
+
+class _RaceStrainer(SoupStrainer):
+    """クラスとsummary属性のどちらかで要素を残すSoupStrainer"""
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # bs4 4.13以降はパース中にこのメソッドでタグを作るか判定する
+        return _is_target_element(name, attrs)
+
+
+# bs4 4.12まではパース中にname引数の関数が (タグ名, 属性) で呼ばれる
+_RACE_STRAINER = _RaceStrainer(_is_target_element)
+
+
+def _build_tree(html: Union[str, bytes]) -> Any:
+    """HTML（文字列またはbytes）をパースしてDOMツリーを作成（selectolaxがあればそちらを使う）"""
+    if HTMLParser is not None:
+        return HTMLParser(html)
+    # 必要なテーブル・見出しの部分木だけを作る
+    return _SoupNode(BeautifulSoup(html, 'html.parser', parse_only=_RACE_STRAINER))
+
+
+def _find_bin_file(html_dir: Path, race_id: str) -> Path:
+    """レースIDの.binファイルを探す（gzip圧縮された.bin.gzも可）"""
+    file_path = html_dir / f'{race_id}.bin'
+    if not file_path.exists():
+        gz_path = html_dir / f'{race_id}.bin.gz'
+        if gz_path.exists():
+            return gz_path
+    return file_path
+
+
+# 試すエンコーディングの順番（EUC-JP → UTF-8 → CP932）
+_ENCODINGS = ('euc-jp', 'utf-8', 'cp932')
+
+# <meta charset>の宣言（先頭1KBだけを見る）
+_RE_CHARSET = re.compile(rb'charset\s*=\s*["\']?([a-z0-9_-]+)')
+_CHARSET_ALIASES = {
+    b'euc-jp': 'euc-jp',
+    b'x-euc-jp': 'euc-jp',
+    b'utf-8': 'utf-8',
+    b'utf8': 'utf-8',
+    b'shift_jis': 'cp932',
+    b'shift-jis': 'cp932',
+    b'sjis': 'cp932',
+    b'x-sjis': 'cp932',
+    b'cp932': 'cp932',
+    b'windows-31j': 'cp932',
+}
+
+
+def _sniff_encoding(html_bytes: bytes) -> Optional[str]:
+    """
+    HTML先頭のcharset宣言（BOMを含む）からエンコーディングを推定
+
+    Returns:
+        str: エンコーディング名。宣言がない・未知の場合はNone
+    """
+    if html_bytes.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8'
+    match = _RE_CHARSET.search(html_bytes[:1024].lower())
+    if match:
+        return _CHARSET_ALIASES.get(match.group(1))
+    return None
+
+
+def _decode_html(html_bytes: bytes, last_encoding: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    HTMLをデコード
+
+    charset宣言があればそのエンコーディングを、なければ前回成功したエンコーディングを最初に試す。
+    宣言と中身が食い違う場合は通常の順番で試し直す。
+
+    Returns:
+        tuple: (デコードしたHTML, 使用したエンコーディング)。失敗した場合は (None, None)
+    """
+    first = _sniff_encoding(html_bytes) or last_encoding
+    if first is not None:
+        try:
+            return html_bytes.decode(first), first
+        except UnicodeDecodeError:
+            pass
+
+    for encoding in _ENCODINGS:
+        if encoding == first:
+            continue
+        try:
+            return html_bytes.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+
+    return None, None
+
+
+def _read_bin_file(file_path: Path) -> bytes:
+    """.binファイルを読み込み（.bin.gzは展開する）"""
+    with open(file_path, 'rb') as f:
+        html_bytes = f.read()
+    if file_path.suffix == '.gz':
+        html_bytes = gzip.decompress(html_bytes)
+    return html_bytes
+
+
+def _parse_weight(text: str) -> Optional[Tuple[int, int]]:
+    """
+    馬体重の表記をパース（例: '486(+2)' → (486, 2)）
+
+    Returns:
+        tuple: (馬体重, 増減)。形式が異なる場合（計不など）はNone
+    """
+    head, sep, tail = text.partition('(')
+    if not sep or not tail.endswith(')'):
+        return None
+    try:
+        # int()が増減の符号（+/-）もそのまま解釈する
+        return int(head), int(tail[:-1])
+    except ValueError:
+        return None
+
+
+def _parse_sei_rei(text: str) -> Optional[Tuple[str, int]]:
+    """
+    性齢の表記をパース（例: '牡3' → ('牡', 3)）
+
+    Returns:
+        tuple: (性別, 年齢)。形式が異なる場合はNone
+    """
+    if len(text) >= 2 and text[0] in '牡牝セ':
+        try:
+            return text[0], int(text[1:])
+        except ValueError:
+            return None
+    return None
+
+
+def _decode_race_id(race_id: str) -> Dict:
+    """
+    レースIDを分解
+
+    race_id形式: YYYY + 競馬場(2) + 開催回(2) + 開催日(2) + レース番号(2)
+
+    Returns:
+        dict: race_number, track_code, kai, day（形式が異なる場合は空のdict）
+    """
+    if len(race_id) != 12:
+        return {}
+    try:
+        return {
+            'race_number': int(race_id[10:12]),
+            'track_code': race_id[4:6],
+            'kai': int(race_id[6:8]),
+            'day': int(race_id[8:10]),
+        }
+    except ValueError:
+        return {}
+
+
+# ===== 馬情報の行パーサー（パーサーの状態を使わないためモジュール関数にしている） =====
+def _parse_horse_row(cells: List[Any], race_id: str) -> Optional[Dict]:
+    """馬情報の1行をパース
+
+    レース結果テーブルのセル配置（race_table_01）:
+    [0]着順 [1]枠 [2]馬番 [3]馬名 [4]性齢 [5]斤量 [6]騎手 [7]タイム
+    [8]着差 [9]通過順位 [10]上がり [11]単勝 [12]人気 [13]馬体重
+    [14]馬体重変化 [15]調教師 ...
+    """
+    # セル数は最初に1回だけ数える（馬名・騎手までの8列がない行は対象外）
+    n = len(cells)
+    if n < 8:
+        return None
+
+    horse_info = {}
+
+    try:
+        # セルのテキストは最初にまとめて取り出す
+        texts = [cell.text(strip=True) for cell in cells]
+
+        # 枠番 (1)
+        waku = texts[1]
+        if waku:
+            try:
+                horse_info['waku'] = int(waku)
+            except ValueError:
+                pass
+
+        # 馬番 (2)
+        umaban = texts[2]
+        if umaban:
+            try:
+                horse_info['umaban'] = int(umaban)
+            except ValueError:
+                pass
+
+        # 馬名 (3)
+        horse_link = cells[3].css_first('a')
+        if horse_link:
+            horse_info['horse_name'] = horse_link.text(strip=True)
+        else:
+            horse_info['horse_name'] = texts[3]
+
+        # 性齢 (4) 例: 牡2, 牝4
+        sei_rei_value = _parse_sei_rei(texts[4])
+        if sei_rei_value:
+            horse_info['sex'], horse_info['age'] = sei_rei_value
+
+        # 斤量 (5)
+        try:
+            horse_info['weight'] = float(texts[5])
+        except ValueError:
+            pass
+
+        # 騎手 (6)
+        jockey_link = cells[6].css_first('a')
+        if jockey_link:
+            horse_info['jockey_name'] = jockey_link.text(strip=True)
+        else:
+            horse_info['jockey_name'] = texts[6]
+
+        # 単勝オッズ (11 or 12)
+        odds_idx = 12 if n > 12 else 11 if n > 11 else None
+        if odds_idx:
+            odds_text = texts[odds_idx]
+            try:
+                horse_info['odds'] = float(odds_text)
+            except ValueError:
+                horse_info['odds'] = None
+
+        # 馬体重 (14)
+        if n > 14:
+            horse_weight_text = texts[14]
+            weight = _parse_weight(horse_weight_text)
+            if weight:
+                horse_info['horse_weight'], horse_info['horse_weight_diff'] = weight
+
+        # 調教師 (18 or 19)
+        trainer_idx = 18 if n > 18 else None
+        if trainer_idx:
+            trainer_text = texts[trainer_idx]
+            # 調教師名から地域記号を除去（例: [東]藤沢和雄 → 藤沢和雄）
+            trainer_match = _RE_TRAINER.search(trainer_text)
+            if trainer_match:
+                horse_info['trainer_name'] = trainer_match.group(1)
+            else:
+                horse_info['trainer_name'] = trainer_text
+
+        return horse_info if 'horse_name' in horse_info else None
+
+    except Exception as e:
+        logger.error("[エラー] 馬行のパース失敗: %s", e)
+        return None
+
+
+def _parse_shutuba_horse_row(cells: List[Any], race_id: str) -> Optional[Dict]:
+    """出馬表の馬情報1行をパース
+
+    出馬表テーブルのセル配置（HorseList行）:
+    [0]枠番 [1]馬番 [2]チェック [3]馬名 [4]性齢 [5]斤量
+    [6]騎手 [7]調教師 [8]馬体重 [9]人気（オッズ前は---.-）
+    """
+    # セル数は最初に1回だけ数える（調教師までの8列がない行は対象外）
+    n = len(cells)
+    if n < 8:
+        return None
+
+    horse_info = {}
+
+    try:
+        # セルのテキストは最初にまとめて取り出す
+        texts = [cell.text(strip=True) for cell in cells]
+
+        # 枠番 (0)
+        try:
+            horse_info['waku'] = int(texts[0])
+        except ValueError:
+            pass
+
+        # 馬番 (1)
+        try:
+            horse_info['umaban'] = int(texts[1])
+        except ValueError:
+            pass
+
+        # 馬名 (3) - HorseInfoクラス内
+        horse_cell = cells[3]
+        # span.HorseNameを探す
+        horse_name_span = horse_cell.css_first('span.HorseName')
+        if horse_name_span:
+            horse_info['horse_name'] = horse_name_span.text(strip=True)
+        else:
+            # リンクから取得
+            horse_link = horse_cell.css_first('a')
+            if horse_link:
+                horse_info['horse_name'] = horse_link.text(strip=True)
+            else:
+                horse_info['horse_name'] = texts[3]
+
+        # 性齢 (4) - Bareiクラス
+        sei_rei_value = _parse_sei_rei(texts[4])
+        if sei_rei_value:
+            horse_info['sex'], horse_info['age'] = sei_rei_value
+
+        # 斤量 (5)
+        try:
+            horse_info['weight'] = float(texts[5])
+        except ValueError:
+            pass
+
+        # 騎手 (6) - Jockeyクラス
+        jockey_link = cells[6].css_first('a')
+        if jockey_link:
+            horse_info['jockey_name'] = jockey_link.text(strip=True)
+        else:
+            horse_info['jockey_name'] = texts[6]
+
+        # 調教師 (7) - Trainerクラス
+        trainer_link = cells[7].css_first('a')
+        if trainer_link:
+            trainer_text = trainer_link.text(strip=True)
+        else:
+            trainer_text = texts[7]
+
+        # 調教師名から地域記号を除去（例: [東]藤沢和雄 → 藤沢和雄）
+        trainer_match = _RE_TRAINER.search(trainer_text)
+        if trainer_match:
+            horse_info['trainer_name'] = trainer_match.group(1)
+        else:
+            horse_info['trainer_name'] = trainer_text
+
+        # 馬体重 (8) - Weightクラス
+        if n > 8:
+            weight_text = texts[8]
+            weight = _parse_weight(weight_text)
+            if weight:
+                horse_info['horse_weight'], horse_info['horse_weight_diff'] = weight
+
+        # オッズは別途取得（出馬表時点ではなし）
+        horse_info['odds'] = None
+
+        return horse_info if 'horse_name' in horse_info else None
+
+    except Exception as e:
+        logger.error("[エラー] 馬行のパース失敗: %s", e)
+        return None
 
 
 class RaceHTMLParser:
@@ -18,6 +454,15 @@ class RaceHTMLParser:
             html_dir: HTMLファイルの格納ディレクトリ
         """
         self.html_dir = Path(html_dir)
+        # 前回デコードに成功したエンコーディング
+        self._last_encoding: Optional[str] = None
+
+    def _decode(self, html_bytes: bytes) -> Optional[str]:
+        """HTMLをデコードし、成功したエンコーディングを次回のために覚えておく"""
+        html, encoding = _decode_html(html_bytes, self._last_encoding)
+        if encoding is not None:
+            self._last_encoding = encoding
+        return html
 
     def parse_race_file(self, race_id: str) -> Tuple[List[Dict], Dict]:
         """
@@ -29,38 +474,39 @@ class RaceHTMLParser:
         Returns:
             tuple: (horses_info, race_info)
         """
-        file_path = self.html_dir / f'{race_id}.bin'
+        file_path = _find_bin_file(self.html_dir, race_id)
+
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"レースファイルが見つかりません: {file_path}") from None
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"レースファイルが見つかりません: {file_path}")
+        # 同じファイルの2回目以降はキャッシュしたパース結果を使う
+        # （呼び出し側で結果を書き換えてもキャッシュに影響しないようコピーを返す）
+        return copy.deepcopy(_parse_file_cached(self, file_path, race_id, mtime_ns))
 
+    def _parse_file(self, file_path: Path, race_id: str) -> Tuple[List[Dict], Dict]:
+        """HTMLファイルを読み込んでパース（キャッシュなし）"""
         # HTMLファイルを読み込み
-        with open(file_path, 'rb') as f:
-            html_bytes = f.read()
+        html_bytes = _read_bin_file(file_path)
 
-        # エンコーディングを試す（EUC-JP → UTF-8 → CP932）
-        html = None
-        for encoding in ['euc-jp', 'utf-8', 'cp932']:
-            try:
-                html = html_bytes.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
+        # エンコーディングを試す（同じディレクトリのファイルは同じエンコーディングのことが多い）
+        html = self._decode(html_bytes)
 
         if html is None:
             raise ValueError(f"HTMLのデコードに失敗: {race_id}")
 
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = _build_tree(html)
 
         # レース情報を抽出
-        race_info = self._parse_race_info(soup, race_id)
+        race_info = self._parse_race_info(tree, race_id)
 
         # 馬情報を抽出
-        horses_info = self._parse_horses_info(soup, race_id)
+        horses_info = self._parse_horses_info(tree, race_id)
 
         return horses_info, race_info
 
-    def _parse_race_info(self, soup: BeautifulSoup, race_id: str) -> Dict:
+    def _parse_race_info(self, tree: Any, race_id: str) -> Dict:
         """レース情報を抽出"""
         race_info = {
             'race_id': race_id,
@@ -74,17 +520,17 @@ class RaceHTMLParser:
 
         try:
             # レース名
-            title = soup.find('h1', class_='RaceName')
+            title = tree.css_first('h1.RaceName')
             if title:
-                race_info['race_name'] = title.get_text(strip=True)
+                race_info['race_name'] = title.text(strip=True)
 
             # 距離・コース種別
-            race_data = soup.find('div', class_='RaceData01')
+            race_data = tree.css_first('div.RaceData01')
             if race_data:
-                text = race_data.get_text()
+                text = race_data.text()
 
                 # 距離（例: ダ1200m, 芝2000m）
-                distance_match = re.search(r'([芝ダ障])(\d+)m', text)
+                distance_match = _RE_DIST.search(text)
                 if distance_match:
                     track_type = distance_match.group(1)
                     race_info['distance'] = int(distance_match.group(2))
@@ -96,154 +542,54 @@ class RaceHTMLParser:
                         race_info['track_type'] = 'obstacle'
 
                 # 天気
-                weather_match = re.search(r'天候\s*:\s*(\S+)', text)
+                weather_match = _RE_WEATHER.search(text)
                 if weather_match:
                     race_info['weather'] = weather_match.group(1)
 
                 # 馬場状態
-                condition_match = re.search(r'馬場\s*:\s*(\S+)', text)
+                condition_match = _RE_COND.search(text)
                 if condition_match:
                     race_info['track_condition'] = condition_match.group(1)
 
         except Exception as e:
-            print(f"[警告] レース情報の抽出エラー ({race_id}): {e}")
+            logger.warning("[警告] レース情報の抽出エラー (%s): %s", race_id, e)
 
         return race_info
 
-    def _parse_horses_info(self, soup: BeautifulSoup, race_id: str) -> List[Dict]:
+    def _parse_horses_info(self, tree: Any, race_id: str) -> List[Dict]:
         """馬情報を抽出"""
         horses_info = []
 
         try:
-            # レース結果テーブルを検索（結果ページ）
-            table = soup.find('table', class_='race_table_01')
-
-            if not table:
-                # 開催前の場合は出馬表テーブル
-                table = soup.find('table', class_='Shutuba_Table')
+            # レース結果テーブル（結果ページ）、開催前の出馬表テーブル、別パターンの出馬表を一度に検索
+            # （1ページにはいずれか1つしかないため、文書中で最初に見つかったものを使う）
+            table = tree.css_first('table.race_table_01, table.Shutuba_Table, table[summary="出馬表"]')
 
             if not table:
-                # 別パターンの出馬表
-                table = soup.find('table', summary='出馬表')
-
-            if not table:
-                print(f"[警告] 馬情報テーブルが見つかりません: {race_id}")
+                logger.warning("[警告] 馬情報テーブルが見つかりません: %s", race_id)
                 return horses_info
 
-            rows = table.find_all('tr')
+            rows = table.css('tr')
 
             for row in rows:
-                cells = row.find_all('td')
+                cells = row.css('td')
 
                 if len(cells) < 8:
                     continue
 
                 try:
-                    horse_info = self._parse_horse_row(cells, race_id)
+                    horse_info = _parse_horse_row(cells, race_id)
                     if horse_info:
                         horses_info.append(horse_info)
                 except Exception as e:
-                    print(f"[警告] 馬情報の抽出エラー: {e}")
+                    logger.warning("[警告] 馬情報の抽出エラー: %s", e)
                     continue
 
         except Exception as e:
-            print(f"[エラー] 馬情報テーブルの抽出エラー ({race_id}): {e}")
+            logger.error("[エラー] 馬情報テーブルの抽出エラー (%s): %s", race_id, e)
 
         return horses_info
 
-    def _parse_horse_row(self, cells: List, race_id: str) -> Optional[Dict]:
-        """馬情報の1行をパース
-
-        レース結果テーブルのセル配置（race_table_01）:
-        [0]着順 [1]枠 [2]馬番 [3]馬名 [4]性齢 [5]斤量 [6]騎手 [7]タイム
-        [8]着差 [9]通過順位 [10]上がり [11]単勝 [12]人気 [13]馬体重
-        [14]馬体重変化 [15]調教師 ...
-        """
-        horse_info = {}
-
-        try:
-            # 枠番 (1)
-            waku = cells[1].get_text(strip=True) if len(cells) > 1 else ''
-            if waku:
-                try:
-                    horse_info['waku'] = int(waku)
-                except ValueError:
-                    pass
-
-            # 馬番 (2)
-            umaban = cells[2].get_text(strip=True) if len(cells) > 2 else ''
-            if umaban:
-                try:
-                    horse_info['umaban'] = int(umaban)
-                except ValueError:
-                    pass
-
-            # 馬名 (3)
-            if len(cells) > 3:
-                horse_link = cells[3].find('a')
-                if horse_link:
-                    horse_info['horse_name'] = horse_link.get_text(strip=True)
-                else:
-                    horse_info['horse_name'] = cells[3].get_text(strip=True)
-
-            # 性齢 (4) 例: 牡2, 牝4
-            if len(cells) > 4:
-                sei_rei = cells[4].get_text(strip=True)
-                match = re.match(r'([牡牝セ])(\d+)', sei_rei)
-                if match:
-                    horse_info['sex'] = match.group(1)
-                    horse_info['age'] = int(match.group(2))
-
-            # 斤量 (5)
-            if len(cells) > 5:
-                kinryo = cells[5].get_text(strip=True)
-                try:
-                    horse_info['weight'] = float(kinryo)
-                except ValueError:
-                    pass
-
-            # 騎手 (6)
-            if len(cells) > 6:
-                jockey_link = cells[6].find('a')
-                if jockey_link:
-                    horse_info['jockey_name'] = jockey_link.get_text(strip=True)
-                else:
-                    horse_info['jockey_name'] = cells[6].get_text(strip=True)
-
-            # 単勝オッズ (11 or 12)
-            odds_idx = 12 if len(cells) > 12 else 11 if len(cells) > 11 else None
-            if odds_idx:
-                odds_text = cells[odds_idx].get_text(strip=True)
-                try:
-                    horse_info['odds'] = float(odds_text)
-                except ValueError:
-                    horse_info['odds'] = None
-
-            # 馬体重 (14)
-            if len(cells) > 14:
-                horse_weight_text = cells[14].get_text(strip=True)
-                match = re.match(r'(\d+)\(([+-]?\d+)\)', horse_weight_text)
-                if match:
-                    horse_info['horse_weight'] = int(match.group(1))
-                    horse_info['horse_weight_diff'] = int(match.group(2))
-
-            # 調教師 (18 or 19)
-            trainer_idx = 18 if len(cells) > 18 else None
-            if trainer_idx:
-                trainer_text = cells[trainer_idx].get_text(strip=True)
-                # 調教師名から地域記号を除去（例: [東]藤沢和雄 → 藤沢和雄）
-                trainer_match = re.search(r'\[.\](.+)', trainer_text)
-                if trainer_match:
-                    horse_info['trainer_name'] = trainer_match.group(1)
-                else:
-                    horse_info['trainer_name'] = trainer_text
-
-            return horse_info if 'horse_name' in horse_info else None
-
-        except Exception as e:
-            print(f"[エラー] 馬行のパース失敗: {e}")
-            return None
-
 
 class ShutubaHTMLParser:
     """出馬表HTMLパーサー（開催前レース用）"""
@@ -254,6 +600,15 @@ class ShutubaHTMLParser:
             html_dir: 出馬表HTMLファイルの格納ディレクトリ
         """
         self.html_dir = Path(html_dir)
+        # 前回デコードに成功したエンコーディング
+        self._last_encoding: Optional[str] = None
+
+    def _decode(self, html_bytes: bytes) -> Optional[str]:
+        """HTMLをデコードし、成功したエンコーディングを次回のために覚えておく"""
+        html, encoding = _decode_html(html_bytes, self._last_encoding)
+        if encoding is not None:
+            self._last_encoding = encoding
+        return html
 
     def parse_shutuba_file(self, race_id: str) -> Tuple[List[Dict], Dict]:
         """
@@ -265,38 +620,39 @@ class ShutubaHTMLParser:
         Returns:
             tuple: (horses_info, race_info)
         """
-        file_path = self.html_dir / f'{race_id}.bin'
+        file_path = _find_bin_file(self.html_dir, race_id)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"出馬表ファイルが見つかりません: {file_path}")
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"出馬表ファイルが見つかりません: {file_path}") from None
 
+        # 同じファイルの2回目以降はキャッシュしたパース結果を使う
+        # （呼び出し側で結果を書き換えてもキャッシュに影響しないようコピーを返す）
+        return copy.deepcopy(_parse_file_cached(self, file_path, race_id, mtime_ns))
+
+    def _parse_file(self, file_path: Path, race_id: str) -> Tuple[List[Dict], Dict]:
+        """HTMLファイルを読み込んでパース（キャッシュなし）"""
         # HTMLファイルを読み込み
-        with open(file_path, 'rb') as f:
-            html_bytes = f.read()
+        html_bytes = _read_bin_file(file_path)
 
-        # エンコーディングを試す（EUC-JP → UTF-8 → CP932）
-        html = None
-        for encoding in ['euc-jp', 'utf-8', 'cp932']:
-            try:
-                html = html_bytes.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
+        # エンコーディングを試す（同じディレクトリのファイルは同じエンコーディングのことが多い）
+        html = self._decode(html_bytes)
 
         if html is None:
             raise ValueError(f"HTMLのデコードに失敗: {race_id}")
 
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = _build_tree(html)
 
         # レース情報を抽出
-        race_info = self._parse_race_info_shutuba(soup, race_id)
+        race_info = self._parse_race_info_shutuba(tree, race_id)
 
         # 馬情報を抽出
-        horses_info = self._parse_horses_info_shutuba(soup, race_id)
+        horses_info = self._parse_horses_info_shutuba(tree, race_id)
 
         return horses_info, race_info
 
-    def _parse_race_info_shutuba(self, soup: BeautifulSoup, race_id: str) -> Dict:
+    def _parse_race_info_shutuba(self, tree: Any, race_id: str) -> Dict:
         """出馬表からレース情報を抽出（拡張版）"""
         race_info = {
             'race_id': race_id,
@@ -313,29 +669,34 @@ class ShutubaHTMLParser:
             'grade': '',  # G1, G2, G3, L, オープンなど
             'race_class': '',  # 競争条件
             'race_symbols': [],  # レース記号（牝、混、ハンデなど）
+            'track_code': '',  # 競馬場コード
+            'kai': 0,  # 開催回
+            'day': 0,  # 開催日目
         }
 
+        # race_idから競馬場コード・開催回・開催日・レース番号を抽出
+        race_info.update(_decode_race_id(race_id))
+
         try:
             # レース名
-            title = soup.find('h1', class_='RaceName')
+            title = tree.css_first('h1.RaceName')
             if title:
-                race_info['race_name'] = title.get_text(strip=True)
+                race_info['race_name'] = title.text(strip=True)
 
                 # グレード情報（レース名に含まれる場合）
-                if 'G1' in race_info['race_name'] or 'GI' in race_info['race_name']:
-                    race_info['grade'] = 'G1'
-                elif 'G2' in race_info['race_name'] or 'GII' in race_info['race_name']:
-                    race_info['grade'] = 'G2'
-                elif 'G3' in race_info['race_name'] or 'GIII' in race_info['race_name']:
-                    race_info['grade'] = 'G3'
+                race_name = race_info['race_name']
+                for grade, markers in _GRADE_MARKERS:
+                    if any(marker in race_name for marker in markers):
+                        race_info['grade'] = grade
+                        break
 
             # RaceData01: 距離・コース種別・回り
-            race_data1 = soup.find('div', class_='RaceData01')
+            race_data1 = tree.css_first('div.RaceData01')
             if race_data1:
-                text = race_data1.get_text()
+                text = race_data1.text()
 
                 # 距離（例: ダ1200m, 芝2000m(右)）
-                distance_match = re.search(r'([芝ダ障])(\d+)m', text)
+                distance_match = _RE_DIST.search(text)
                 if distance_match:
                     surface_char = distance_match.group(1)
                     race_info['distance'] = int(distance_match.group(2))
@@ -351,191 +712,123 @@ class ShutubaHTMLParser:
                         race_info['surface'] = '障害'
 
                 # 回り方向（例: (右)、(左)、(直線)）
-                if '(右)' in text or '（右）' in text:
-                    race_info['direction'] = '右'
-                elif '(左)' in text or '（左）' in text:
-                    race_info['direction'] = '左'
-                elif '(直線)' in text or '（直線）' in text:
-                    race_info['direction'] = '直線'
+                race_info['direction'] = next(
+                    (direction for marker, direction in _DIRECTION_MARKERS.items() if marker in text), ''
+                )
 
             # RaceData02: 競馬場、回次、日数、競争条件など
-            race_data2 = soup.find('div', class_='RaceData02')
+            race_data2 = tree.css_first('div.RaceData02')
             if race_data2:
-                spans = race_data2.find_all('span')
+                # spanのテキストは最初にまとめて取り出す
+                span_texts = [span.text(strip=True) for span in race_data2.css('span')]
 
-                if len(spans) >= 2:
+                if len(span_texts) >= 2:
                     # 0番目: 開催回次（例: "5回"）
                     # 1番目: 競馬場名（例: "中山"）
-                    race_info['racetrack'] = spans[1].get_text(strip=True) if len(spans) > 1 else ''
+                    race_info['racetrack'] = span_texts[1]
 
                     # レース記号を収集（牝、混、ハンデなど）
-                    for span in spans:
-                        text = span.get_text(strip=True)
-                        if text in ['牝', '牡', '混', 'ハンデ', '定量', '別定', '馬齢',
-                                   '見習騎手', 'せん', '国際', '指定', '特指', '抽選']:
-                            race_info['race_symbols'].append(text)
+                    race_info['race_symbols'] = [text for text in span_texts if text in _RACE_SYMBOLS]
 
+                    for text in span_texts:
                         # 競争条件（例: "サラ系2歳"）
                         if 'サラ' in text or '系' in text:
                             race_info['race_class'] = text
 
                         # 出走頭数（例: "14頭"）
                         if '頭' in text:
-                            num_match = re.search(r'(\d+)頭', text)
+                            num_match = _RE_NUM_HEAD.search(text)
                             if num_match:
                                 race_info['num_horses'] = int(num_match.group(1))
 
-            # race_idから競馬場コードとレース番号を抽出
-            # race_id形式: YYYYMMDD + 競馬場(2) + 開催回(2) + 開催日(2) + レース番号(2)
-            if len(race_id) == 12:
-                try:
-                    race_info['race_number'] = int(race_id[10:12])
-                except:
-                    pass
-
         except Exception as e:
-            print(f"[警告] レース情報の抽出エラー ({race_id}): {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[警告] レース情報の抽出エラー (%s): %s", race_id, e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("スタックトレース", exc_info=True)
 
         return race_info
 
-    def _parse_horses_info_shutuba(self, soup: BeautifulSoup, race_id: str) -> List[Dict]:
+    def _parse_horses_info_shutuba(self, tree: Any, race_id: str) -> List[Dict]:
         """出馬表から馬情報を抽出"""
         horses_info = []
 
         try:
             # 出馬表テーブル
-            table = soup.find('table', class_='Shutuba_Table')
+            table = tree.css_first('table.Shutuba_Table')
 
             if not table:
-                print(f"[警告] 出馬表テーブルが見つかりません: {race_id}")
+                logger.warning("[警告] 出馬表テーブルが見つかりません: %s", race_id)
                 return horses_info
 
             # HorseList行を検索
-            tbody = table.find('tbody')
+            tbody = table.css_first('tbody')
             if tbody:
-                rows = tbody.find_all('tr', class_='HorseList')
+                rows = tbody.css('tr.HorseList')
             else:
-                rows = table.find_all('tr', class_='HorseList')
+                rows = table.css('tr.HorseList')
 
             for row in rows:
-                cells = row.find_all('td')
+                cells = row.css('td')
 
                 if len(cells) < 8:
                     continue
 
                 try:
-                    horse_info = self._parse_shutuba_horse_row(cells, race_id)
+                    horse_info = _parse_shutuba_horse_row(cells, race_id)
                     if horse_info:
                         horses_info.append(horse_info)
                 except Exception as e:
-                    print(f"[警告] 馬情報の抽出エラー: {e}")
+                    logger.warning("[警告] 馬情報の抽出エラー: %s", e)
                     continue
 
         except Exception as e:
-            print(f"[エラー] 馬情報テーブルの抽出エラー ({race_id}): {e}")
+            logger.error("[エラー] 馬情報テーブルの抽出エラー (%s): %s", race_id, e)
 
         return horses_info
 
-    def _parse_shutuba_horse_row(self, cells: List, race_id: str) -> Optional[Dict]:
-        """出馬表の馬情報1行をパース
 
-        出馬表テーブルのセル配置（HorseList行）:
-        [0]枠番 [1]馬番 [2]チェック [3]馬名 [4]性齢 [5]斤量
-        [6]騎手 [7]調教師 [8]馬体重 [9]人気（オッズ前は---.-）
-        """
-        horse_info = {}
+# パース結果のキャッシュ（(パーサークラス, ファイルパス, mtime) → 結果、古いものから捨てる）
+_PARSE_CACHE_SIZE = 2048
+_parse_cache: 'OrderedDict[Tuple[type, str, int], Tuple[List[Dict], Dict]]' = OrderedDict()
+_parse_cache_lock = threading.Lock()
 
-        try:
-            # 枠番 (0)
-            if len(cells) > 0:
-                waku_text = cells[0].get_text(strip=True)
-                try:
-                    horse_info['waku'] = int(waku_text)
-                except ValueError:
-                    pass
 
-            # 馬番 (1)
-            if len(cells) > 1:
-                umaban_text = cells[1].get_text(strip=True)
-                try:
-                    horse_info['umaban'] = int(umaban_text)
-                except ValueError:
-                    pass
-
-            # 馬名 (3) - HorseInfoクラス内
-            if len(cells) > 3:
-                horse_cell = cells[3]
-                # span.HorseNameを探す
-                horse_name_span = horse_cell.find('span', class_='HorseName')
-                if horse_name_span:
-                    horse_info['horse_name'] = horse_name_span.get_text(strip=True)
-                else:
-                    # リンクから取得
-                    horse_link = horse_cell.find('a')
-                    if horse_link:
-                        horse_info['horse_name'] = horse_link.get_text(strip=True)
-                    else:
-                        horse_info['horse_name'] = horse_cell.get_text(strip=True)
-
-            # 性齢 (4) - Bareiクラス
-            if len(cells) > 4:
-                barei_text = cells[4].get_text(strip=True)
-                match = re.match(r'([牡牝セ])(\d+)', barei_text)
-                if match:
-                    horse_info['sex'] = match.group(1)
-                    horse_info['age'] = int(match.group(2))
-
-            # 斤量 (5)
-            if len(cells) > 5:
-                kinryo_text = cells[5].get_text(strip=True)
-                try:
-                    horse_info['weight'] = float(kinryo_text)
-                except ValueError:
-                    pass
-
-            # 騎手 (6) - Jockeyクラス
-            if len(cells) > 6:
-                jockey_cell = cells[6]
-                jockey_link = jockey_cell.find('a')
-                if jockey_link:
-                    horse_info['jockey_name'] = jockey_link.get_text(strip=True)
-                else:
-                    horse_info['jockey_name'] = jockey_cell.get_text(strip=True)
-
-            # 調教師 (7) - Trainerクラス
-            if len(cells) > 7:
-                trainer_cell = cells[7]
-                trainer_link = trainer_cell.find('a')
-                if trainer_link:
-                    trainer_text = trainer_link.get_text(strip=True)
-                else:
-                    trainer_text = trainer_cell.get_text(strip=True)
-
-                # 調教師名から地域記号を除去（例: [東]藤沢和雄 → 藤沢和雄）
-                trainer_match = re.search(r'\[.\](.+)', trainer_text)
-                if trainer_match:
-                    horse_info['trainer_name'] = trainer_match.group(1)
-                else:
-                    horse_info['trainer_name'] = trainer_text
-
-            # 馬体重 (8) - Weightクラス
-            if len(cells) > 8:
-                weight_text = cells[8].get_text(strip=True)
-                match = re.match(r'(\d+)\(([+-]?\d+)\)', weight_text)
-                if match:
-                    horse_info['horse_weight'] = int(match.group(1))
-                    horse_info['horse_weight_diff'] = int(match.group(2))
-
-            # オッズは別途取得（出馬表時点ではなし）
-            horse_info['odds'] = None
-
-            return horse_info if 'horse_name' in horse_info else None
+def _parse_file_cached(parser: Any, file_path: Path, race_id: str,
+                       mtime_ns: int) -> Tuple[List[Dict], Dict]:
+    """
+    パース結果をキャッシュ（ファイルが更新されるとmtimeが変わるので再パースされる）
+    キャッシュにない場合は呼び出し元のパーサー自身でパースする
 
-        except Exception as e:
-            print(f"[エラー] 馬行のパース失敗: {e}")
-            return None
+    Args:
+        parser: RaceHTMLParser / ShutubaHTMLParser（サブクラスを含む）
+        file_path: .binファイルのパス
+        race_id: レースID
+        mtime_ns: ファイルの更新時刻
+
+    Returns:
+        tuple: (horses_info, race_info)。キャッシュと共有しているため書き換えないこと
+    """
+    # サブクラスは_parse_fileの結果が変わりうるため、クラスもキーに含める
+    key = (type(parser), str(file_path), mtime_ns)
+    with _parse_cache_lock:
+        result = _parse_cache.get(key)
+        if result is not None:
+            _parse_cache.move_to_end(key)
+            return result
+
+    result = parser._parse_file(file_path, race_id)
+
+    with _parse_cache_lock:
+        _parse_cache[key] = result
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return result
+
+
+def clear_parse_cache() -> None:
+    """parse_race_file / parse_shutuba_file のパース結果のキャッシュを消去"""
+    with _parse_cache_lock:
+        _parse_cache.clear()
 
 
 class OddsFetcher:
@@ -555,44 +848,49 @@ class OddsFetcher:
         Returns:
             dict: {馬番: オッズ}
         """
-        import requests
-        import time
-        from app.utils.request_manager import make_request
+        if make_request is None:
+            logger.error("[エラー] オッズ取得に必要なapp.utils.request_managerが見つかりません: %s", race_id)
+            return {}
 
         odds_url = f'https://race.netkeiba.com/odds/index.html?race_id={race_id}&rf=race_submenu'
 
         try:
             response = make_request(odds_url)
             if response is None:
-                print(f"[エラー] オッズページの取得に失敗: {race_id}")
+                logger.error("[エラー] オッズページの取得に失敗: %s", race_id)
                 return {}
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # 宣言されたエンコーディングで先にデコードしておく
+            # （selectolaxはbytesをUTF-8として、BeautifulSoupは文字コードを推測しながら読むため）
+            html, _ = _decode_html(response.content)
+
+            # レースHTMLと同じくselectolaxでパース（BeautifulSoupのDOMは作らない）
+            tree = _build_tree(html if html is not None else response.content)
 
             odds_dict = {}
 
             # 単勝オッズテーブルを検索
-            odds_table = soup.find('table', class_='Odds_Table')
+            odds_table = tree.css_first('table.Odds_Table')
             if not odds_table:
-                print(f"[警告] オッズテーブルが見つかりません: {race_id}")
+                logger.warning("[警告] オッズテーブルが見つかりません: %s", race_id)
                 return {}
 
-            rows = odds_table.find_all('tr')
+            rows = odds_table.css('tr')
 
             for row in rows:
-                cells = row.find_all('td')
+                cells = row.css('td')
                 if len(cells) < 2:
                     continue
 
                 # 馬番
-                umaban_cell = cells[0].get_text(strip=True)
+                umaban_cell = cells[0].text(strip=True)
                 try:
                     umaban = int(umaban_cell)
                 except ValueError:
                     continue
 
                 # オッズ
-                odds_cell = cells[1].get_text(strip=True)
+                odds_cell = cells[1].text(strip=True)
                 try:
                     odds = float(odds_cell)
                     odds_dict[umaban] = odds
@@ -602,9 +900,34 @@ class OddsFetcher:
             return odds_dict
 
         except Exception as e:
-            print(f"[エラー] オッズ取得エラー ({race_id}): {e}")
+            logger.error("[エラー] オッズ取得エラー (%s): %s", race_id, e)
             return {}
 
+    def fetch_many(self, race_ids: List[str], max_workers: int = 8) -> Dict[str, Dict[int, float]]:
+        """
+        複数レースの単勝オッズをまとめて取得（同時に取得するのはmax_workers件まで）
+
+        Args:
+            race_ids: レースIDのリスト
+            max_workers: 同時に取得する件数
+
+        Returns:
+            dict: {レースID: {馬番: オッズ}}
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(race_ids, executor.map(self.fetch_odds, race_ids)))
+
+
+def _apply_odds(horses_info: List[Dict], odds_dict: Dict[int, float]) -> None:
+    """馬情報にオッズを設定（取得できなかった馬はデフォルトオッズ）"""
+    for horse in horses_info:
+        umaban = horse.get('umaban')
+        if umaban and umaban in odds_dict:
+            horse['odds'] = odds_dict[umaban]
+        elif 'odds' not in horse or horse['odds'] is None:
+            # デフォルトオッズ
+            horse['odds'] = 5.0
+
 
 def parse_race(race_id: str, fetch_odds: bool = False, html_dir: str = 'data/html/race') -> Tuple[List[Dict], Dict]:
     """
@@ -621,30 +944,123 @@ def parse_race(race_id: str, fetch_odds: bool = False, html_dir: str = 'data/htm
     parser = RaceHTMLParser(html_dir=html_dir)
     horses_info, race_info = parser.parse_race_file(race_id)
 
-    # オッズを取得する場合
-    if fetch_odds:
-        fetcher = OddsFetcher()
-        odds_dict = fetcher.fetch_odds(race_id)
-
-        # 馬情報にオッズを追加
-        for horse in horses_info:
-            umaban = horse.get('umaban')
-            if umaban and umaban in odds_dict:
-                horse['odds'] = odds_dict[umaban]
-            elif 'odds' not in horse or horse['odds'] is None:
-                # デフォルトオッズ
-                horse['odds'] = 5.0
-
-    # オッズがない馬にデフォルト値を設定
-    for horse in horses_info:
-        if 'odds' not in horse or horse['odds'] is None:
-            horse['odds'] = 5.0
+    # オッズを取得する場合は取得したオッズを、それ以外・取得できなかった馬はデフォルト値を設定
+    _apply_odds(horses_info, OddsFetcher().fetch_odds(race_id) if fetch_odds else {})
 
     race_info['num_horses'] = len(horses_info)
 
     return horses_info, race_info
 
 
+def parse_races(race_ids: List[str], fetch_odds: bool = False,
+                html_dir: str = 'data/html/race') -> List[Tuple[List[Dict], Dict]]:
+    """
+    複数のレースIDから馬情報とレース情報を抽出（parse_raceのまとめて版）
+    オッズは最初に全レース分をまとめて取得してから各レースに設定する
+
+    Args:
+        race_ids: レースIDのリスト
+        fetch_odds: オッズを取得するか（開催前レース用）
+        html_dir: HTMLディレクトリ
+
+    Returns:
+        list: race_idsと同じ順番の (horses_info, race_info)
+    """
+    odds_by_race = OddsFetcher().fetch_many(race_ids) if fetch_odds else {}
+
+    parser = RaceHTMLParser(html_dir=html_dir)
+    results = []
+    for race_id in race_ids:
+        horses_info, race_info = parser.parse_race_file(race_id)
+        _apply_odds(horses_info, odds_by_race.get(race_id, {}))
+        race_info['num_horses'] = len(horses_info)
+        results.append((horses_info, race_info))
+
+    return results
+
+
+# parse_races_bulkのワーカープロセス内で使い回すパーサー（エンコーディングの記憶も使い回す）
+_worker_parser: Optional[RaceHTMLParser] = None
+
+
+def _init_bulk_worker(html_dir: str) -> None:
+    """parse_races_bulkのワーカープロセス初期化（1行ごとの警告は出さずエラーだけ出す）"""
+    global _worker_parser
+    logger.setLevel(logging.ERROR)
+    _worker_parser = RaceHTMLParser(html_dir=html_dir)
+
+
+def _parse_race_file_worker(race_id: str) -> Optional[Tuple[List[Dict], Dict]]:
+    """parse_races_bulkのワーカー処理（1レース分のHTMLをパース）"""
+    # レースIDは重複しないため、キャッシュを通さずに直接パースする
+    file_path = _find_bin_file(_worker_parser.html_dir, race_id)
+    try:
+        return _worker_parser._parse_file(file_path, race_id)
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning("[警告] レースHTMLのパースに失敗 (%s): %s", race_id, e)
+        return None
+
+
+def _advise_willneed(file_path: Path) -> None:
+    """ファイルを先読みするようOSに伝える（posix_fadvise WILLNEED）"""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _start_prefetch(race_ids: List[str], html_dir: str) -> Optional[ThreadPoolExecutor]:
+    """
+    パースする予定の.binファイルの先読みをバックグラウンドで開始
+
+    Returns:
+        ThreadPoolExecutor: 先読み用のスレッドプール（posix_fadviseがない環境ではNone）
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return None
+    directory = Path(html_dir)
+    prefetcher = ThreadPoolExecutor(max_workers=16)
+    for race_id in race_ids:
+        prefetcher.submit(_advise_willneed, _find_bin_file(directory, race_id))
+    return prefetcher
+
+
+def parse_races_bulk(race_ids: List[str], html_dir: str = 'data/html/race',
+                     max_workers: Optional[int] = None) -> List[Optional[Tuple[List[Dict], Dict]]]:
+    """
+    複数のレースHTMLを複数プロセスで並列にパース
+
+    Args:
+        race_ids: レースIDのリスト
+        html_dir: HTMLディレクトリ
+        max_workers: プロセス数（Noneの場合はCPUコア数）
+
+    Returns:
+        list: race_idsと同じ順番の (horses_info, race_info)。ファイルがない・デコードできない場合はNone
+    """
+    prefetcher = None
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_bulk_worker,
+                                 initargs=(html_dir,)) as executor:
+            # 先にタスクを投入してワーカーを起動しておく（forkの場合は最初の投入時に全ワーカーが起動する）
+            # スレッドが動いている状態でforkするとデッドロックしうるため、先読みはその後に始める
+            results = executor.map(_parse_race_file_worker, race_ids, chunksize=32)
+
+            # パースと並行してファイルの読み込みを先に進めておく
+            prefetcher = _start_prefetch(race_ids, html_dir)
+            return list(results)
+    finally:
+        if prefetcher is not None:
+            # 先読みが終わっていないファイルはもう不要
+            prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
 def parse_shutuba(race_id: str, fetch_odds: bool = True, html_dir: str = 'data/html/shutuba') -> Tuple[List[Dict], Dict]:
     """
     出馬表から馬情報とレース情報を抽出（便利関数）
@@ -660,24 +1076,8 @@ def parse_shutuba(race_id: str, fetch_odds: bool = True, html_dir: str = 'data/h
     parser = ShutubaHTMLParser(html_dir=html_dir)
     horses_info, race_info = parser.parse_shutuba_file(race_id)
 
-    # オッズを取得する場合
-    if fetch_odds:
-        fetcher = OddsFetcher()
-        odds_dict = fetcher.fetch_odds(race_id)
-
-        # 馬情報にオッズを追加
-        for horse in horses_info:
-            umaban = horse.get('umaban')
-            if umaban and umaban in odds_dict:
-                horse['odds'] = odds_dict[umaban]
-            elif 'odds' not in horse or horse['odds'] is None:
-                # デフォルトオッズ（オッズ取得失敗時）
-                horse['odds'] = 5.0
-    else:
-        # オッズ取得しない場合はデフォルト値
-        for horse in horses_info:
-            if 'odds' not in horse or horse['odds'] is None:
-                horse['odds'] = 5.0
+    # オッズを取得する場合は取得したオッズを、それ以外・取得できなかった馬はデフォルト値を設定
+    _apply_odds(horses_info, OddsFetcher().fetch_odds(race_id) if fetch_odds else {})
 
     race_info['num_horses'] = len(horses_info)
 
@@ -1,13 +1,20 @@
 """
 ログユーティリティ - 統一されたログ出力
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
 
+# ロガー名ごとに動いているQueueListener（同じ名前で作り直したときに前のものを止める）
+_listeners = {}
+
+
 class KeibaLogger:
     """競馬アプリケーション用ロガー"""
 
@@ -24,7 +31,10 @@ class KeibaLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
 
-        # 既存のハンドラをクリア
+        # 既存のハンドラをクリア（同じ名前の前のリスナーも止める）
+        previous = _listeners.pop(name, None)
+        if previous is not None:
+            _stop_listener(previous)
         if self.logger.handlers:
             self.logger.handlers.clear()
 
@@ -34,12 +44,14 @@ class KeibaLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
 
+        handlers = []
+
         # コンソールハンドラ
         if console:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(level)
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
         # ファイルハンドラ
         if log_file or log_dir:
@@ -47,7 +59,26 @@ class KeibaLogger:
             file_handler = logging.FileHandler(log_path, encoding='utf-8')
             file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        # 実際の書き込みはバックグラウンドのリスナースレッドで行い、
+        # ログを出す側はキューに積むだけにする
+        self._listener = None
+        if handlers:
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(QueueHandler(log_queue))
+            self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            _listeners[name] = self._listener
+
+    def close(self):
+        """キューに残っているログを書き出してリスナーを止める"""
+        if self._listener is None:
+            return
+        if _listeners.get(self.logger.name) is self._listener:
+            del _listeners[self.logger.name]
+        _stop_listener(self._listener)
+        self._listener = None
 
     def _setup_log_file(self, log_dir: str, log_file: Optional[str], name: str) -> Path:
         """ログファイルのパスを設定"""
@@ -86,6 +117,21 @@ class KeibaLogger:
         self.logger.exception(msg, *args, **kwargs)
 
 
+def _stop_listener(listener: QueueListener):
+    """リスナーを止めてハンドラを閉じる（キューに残っているログは書き出される）"""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def _stop_all_listeners():
+    """終了時にすべてのリスナーを止め、書き出し待ちのログを失わないようにする"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        _stop_listener(listener)
+
+
 def get_logger(name: str, **kwargs) -> KeibaLogger:
     """
     ロガーを取得
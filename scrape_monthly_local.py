@@ -5,14 +5,15 @@
 
 使用方法:
     python scrape_monthly_local.py --year-month 2024-12
+    python scrape_monthly_local.py --year-month-range 2024-01:2024-12
 """
 import argparse
 import sys
-import subprocess
 from datetime import datetime, timedelta
-from pathlib import Path
+from functools import lru_cache
 
 
+@lru_cache(maxsize=128)
 def get_month_date_range(year: int, month: int):
     """
     指定月の開始日と終了日を取得
@@ -38,9 +39,49 @@ def get_month_date_range(year: int, month: int):
     return start_date, end_date
 
 
+def parse_year_month(text: str):
+    """
+    年月の文字列をパース
+
+    Args:
+        text: 年月（例: '2024-12'）
+
+    Returns:
+        tuple: (year, month)
+
+    Raises:
+        ValueError: 形式が正しくない場合
+    """
+    year, month = map(int, text.split('-'))
+    if not 1 <= month <= 12:
+        raise ValueError(f"月が範囲外です: {text}")
+    return year, month
+
+
+def iter_months(start: tuple, end: tuple):
+    """
+    開始年月から終了年月までの各月を順に返す
+
+    Args:
+        start: 開始年月 (year, month)
+        end: 終了年月 (year, month)
+
+    Returns:
+        list[tuple]: (year, month) のリスト
+    """
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
 def run_scraper(start_date: str, end_date: str):
     """
-    app/data_scraper_cli.py を実行してスクレイピング
+    app/data_scraper_cli.py のmain()を同じプロセス内で呼び出してスクレイピング
 
     Args:
         start_date: 開始日（例: '20241201'）
@@ -49,81 +90,85 @@ def run_scraper(start_date: str, end_date: str):
     Returns:
         int: 終了コード（0=成功、1=失敗）
     """
-    # data_scraper_cli.py のパスを確認
-    scraper_path = Path('app/data_scraper_cli.py')
-
-    if not scraper_path.exists():
-        print(f"エラー: {scraper_path} が見つかりません")
+    try:
+        from app.data_scraper_cli import main as scraper_main
+    except ImportError as e:
+        print(f"エラー: app/data_scraper_cli.py を読み込めません ({e})")
         print("このスクリプトはリポジトリのルートディレクトリから実行してください")
         return 1
 
-    # スクレイピングコマンドを実行
-    cmd = [
-        sys.executable,
-        str(scraper_path),
-        '--start-date', start_date,
-        '--end-date', end_date
-    ]
+    argv = ['--start-date', start_date, '--end-date', end_date]
 
     print(f"\n{'='*80}")
     print(f"スクレイピング実行: {start_date} ~ {end_date}")
-    print(f"コマンド: {' '.join(cmd)}")
+    print(f"引数: {' '.join(argv)}")
     print(f"{'='*80}\n")
 
     try:
-        result = subprocess.run(
-            cmd,
-            check=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            encoding='utf-8'
-        )
-
-        # 出力を表示
-        print(result.stdout)
-
-        if result.returncode == 0:
-            print(f"\n{'='*80}")
-            print("スクレイピング完了")
-            print(f"{'='*80}")
-        else:
-            print(f"\n{'='*80}")
-            print(f"スクレイピング失敗（終了コード: {result.returncode}）")
-            print(f"{'='*80}")
-
-        return result.returncode
-
+        # 別プロセスを起動せずに呼び出す（出力もそのまま表示される）
+        returncode = scraper_main(argv)
+    except SystemExit as e:
+        # 引数エラーなどでsys.exit()された場合も終了コードとして扱う
+        returncode = e.code if isinstance(e.code, int) else 1
     except Exception as e:
         print(f"\nエラー: {e}")
         return 1
 
+    if returncode == 0:
+        print(f"\n{'='*80}")
+        print("スクレイピング完了")
+        print(f"{'='*80}")
+    else:
+        print(f"\n{'='*80}")
+        print(f"スクレイピング失敗（終了コード: {returncode}）")
+        print(f"{'='*80}")
+
+    return returncode
+
 
 def main():
     parser = argparse.ArgumentParser(
         description='競馬データ月次スクレイピング（ローカルスクレイパー使用）'
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         '--year-month',
         type=str,
-        required=True,
         help='取得する年月（例: 2024-12）'
     )
+    target.add_argument(
+        '--year-month-range',
+        type=str,
+        help='取得する年月の範囲（例: 2024-01:2024-12）。範囲全体を1回のスクレイピングで取得する'
+    )
 
     args = parser.parse_args()
 
     # 年月のパース
     try:
-        year, month = map(int, args.year_month.split('-'))
+        if args.year_month_range:
+            start_text, end_text = args.year_month_range.split(':')
+            months = iter_months(parse_year_month(start_text), parse_year_month(end_text))
+        else:
+            months = [parse_year_month(args.year_month)]
     except ValueError:
-        print("エラー: 年月の形式が正しくありません。例: 2024-12")
+        print("エラー: 年月の形式が正しくありません。例: 2024-12 または 2024-01:2024-12")
         sys.exit(1)
 
-    # 日付範囲を取得
-    start_date, end_date = get_month_date_range(year, month)
+    if not months:
+        print("エラー: 開始年月が終了年月より後になっています")
+        sys.exit(1)
+
+    # 連続した月は1つの期間にまとめ、1回の呼び出しで取得する
+    # （リクエスト上限・レート制限・HTTP接続・カレンダーのキャッシュを全月で共有する）
+    start_date, _ = get_month_date_range(*months[0])
+    _, end_date = get_month_date_range(*months[-1])
 
     print(f"\n{'='*80}")
-    print(f"月次スクレイピング: {year}年{month}月")
+    if len(months) == 1:
+        print(f"月次スクレイピング: {months[0][0]}年{months[0][1]}月")
+    else:
+        print(f"月次スクレイピング: {months[0][0]}年{months[0][1]}月 ～ {months[-1][0]}年{months[-1][1]}月（{len(months)}か月）")
     print(f"期間: {start_date} ~ {end_date}")
     print(f"{'='*80}")
 
@@ -0,0 +1,54 @@
+"""
+data_scraper_cli のテスト
+
+    python -m unittest
+"""
+import unittest
+from datetime import date
+
+from app import data_scraper_cli
+
+
+class ParseMonthTest(unittest.TestCase):
+
+    def test_supported_formats(self):
+        for month_str in ('2025-01', '2025/01', '202501'):
+            with self.subTest(month_str=month_str):
+                self.assertEqual(data_scraper_cli.parse_month(month_str), (2025, 1))
+
+    def test_rejects_non_digit_input(self):
+        # int()は符号・空白・_を受け付けるため、それらを含む形式も弾くこと
+        for month_str in ('2025+1', '-20212', '2_2512', '2025- 1', ' 20251', '2025-+1', 'abcd-12'):
+            with self.subTest(month_str=month_str):
+                with self.assertRaises(ValueError):
+                    data_scraper_cli.parse_month(month_str)
+
+    def test_rejects_out_of_range_month(self):
+        for month_str in ('2025-00', '2025-13', '202513'):
+            with self.subTest(month_str=month_str):
+                with self.assertRaises(ValueError):
+                    data_scraper_cli.parse_month(month_str)
+
+
+class ParseDateRangeTest(unittest.TestCase):
+
+    def test_valid_range(self):
+        self.assertEqual(
+            data_scraper_cli._parse_date_range('2025-12-01', '20251231'),
+            (date(2025, 12, 1), date(2025, 12, 31)),
+        )
+
+    def test_start_after_end(self):
+        with self.assertRaisesRegex(ValueError, '開始日が終了日より後です'):
+            data_scraper_cli._parse_date_range('2025-12-31', '2025-12-01')
+
+    def test_invalid_date_is_reported_before_order(self):
+        # 文字列としては開始日の方が大きいが、無効な日付として扱うこと
+        for start_str, end_str in (('2025-13-01', '2025-12-31'), ('2025-12-01', '2025-02-30')):
+            with self.subTest(start_str=start_str, end_str=end_str):
+                with self.assertRaisesRegex(ValueError, '無効な日付形式'):
+                    data_scraper_cli._parse_date_range(start_str, end_str)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+html_parser のテスト
+
+    python -m unittest
+"""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import html_parser
+
+
+RACE_ID = '202405050811'
+
+
+def _summary_table_html(num_horses: int) -> str:
+    """クラスを持たない table[summary="出馬表"] だけのページ"""
+    rows = ''.join(
+        f'<tr><td>{i}</td><td>{i}</td><td>{i}</td>'
+        f'<td><a href="/horse/20190000{i:02d}/">馬{i}</a></td>'
+        f'<td>牡3</td><td>57.0</td><td><a href="/jockey/{i}/">騎手{i}</a></td><td>1:33.0</td></tr>'
+        for i in range(1, num_horses + 1)
+    )
+    return (
+        '<html><head><meta charset="EUC-JP"></head><body>'
+        f'<table summary="出馬表"><tr><th>枠</th></tr>{rows}</table>'
+        '</body></html>'
+    )
+
+
+class SoupFallbackTest(unittest.TestCase):
+    """selectolaxがない場合（BeautifulSoupでのパース）のテスト"""
+
+    def setUp(self):
+        patcher = mock.patch.object(html_parser, 'HTMLParser', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        html_parser.clear_parse_cache()
+        self.addCleanup(html_parser.clear_parse_cache)
+
+    def test_classless_summary_table_is_parsed(self):
+        with tempfile.TemporaryDirectory() as html_dir:
+            Path(html_dir, f'{RACE_ID}.bin').write_bytes(_summary_table_html(5).encode('euc-jp'))
+            horses_info, _ = html_parser.RaceHTMLParser(html_dir).parse_race_file(RACE_ID)
+
+        self.assertEqual(len(horses_info), 5)
+        self.assertEqual([h['horse_name'] for h in horses_info], [f'馬{i}' for i in range(1, 6)])
+        self.assertEqual(horses_info[0]['jockey_name'], '騎手1')
+
+    def test_strainer_keeps_only_target_elements(self):
+        tree = html_parser._build_tree(
+            '<div><p>不要</p><h1 class="RaceName Other">名前</h1>'
+            '<table summary="その他"><tr><td>x</td></tr></table></div>'
+        )
+        self.assertEqual(tree.css_first('h1').text(strip=True), '名前')
+        self.assertIsNone(tree.css_first('p'))
+        self.assertIsNone(tree.css_first('table'))
+
+
+class ParseCacheTest(unittest.TestCase):
+    """parse_race_file のキャッシュのテスト"""
+
+    def setUp(self):
+        html_parser.clear_parse_cache()
+        self.addCleanup(html_parser.clear_parse_cache)
+
+    def test_subclass_override_is_used(self):
+        class MarkedParser(html_parser.RaceHTMLParser):
+            def _parse_file(self, file_path, race_id):
+                horses_info, race_info = super()._parse_file(file_path, race_id)
+                race_info['marked'] = True
+                return horses_info, race_info
+
+        with tempfile.TemporaryDirectory() as html_dir:
+            Path(html_dir, f'{RACE_ID}.bin').write_bytes(_summary_table_html(3).encode('euc-jp'))
+            # 基底クラスで先にパースしてキャッシュに載せても、サブクラスの結果は別に作られる
+            _, base_info = html_parser.RaceHTMLParser(html_dir).parse_race_file(RACE_ID)
+            _, sub_info = MarkedParser(html_dir).parse_race_file(RACE_ID)
+
+        self.assertNotIn('marked', base_info)
+        self.assertTrue(sub_info['marked'])
+
+    def test_subclass_with_extra_init_args(self):
+        class TaggedParser(html_parser.RaceHTMLParser):
+            def __init__(self, html_dir, tag):
+                super().__init__(html_dir)
+                self.tag = tag
+
+            def _parse_file(self, file_path, race_id):
+                horses_info, race_info = super()._parse_file(file_path, race_id)
+                race_info['tag'] = self.tag
+                return horses_info, race_info
+
+        with tempfile.TemporaryDirectory() as html_dir:
+            Path(html_dir, f'{RACE_ID}.bin').write_bytes(_summary_table_html(3).encode('euc-jp'))
+            _, race_info = TaggedParser(html_dir, 'x').parse_race_file(RACE_ID)
+
+        self.assertEqual(race_info['tag'], 'x')
+
+    def test_encoding_is_remembered_by_the_caller(self):
+        with tempfile.TemporaryDirectory() as html_dir:
+            Path(html_dir, f'{RACE_ID}.bin').write_bytes(_summary_table_html(3).encode('euc-jp'))
+            parser = html_parser.RaceHTMLParser(html_dir)
+            parser.parse_race_file(RACE_ID)
+
+        self.assertEqual(parser._last_encoding, 'euc-jp')
+
+    def test_bulk_parse(self):
+        with tempfile.TemporaryDirectory() as html_dir:
+            Path(html_dir, f'{RACE_ID}.bin').write_bytes(_summary_table_html(4).encode('euc-jp'))
+            results = html_parser.parse_races_bulk([RACE_ID, '202405050812'], html_dir, max_workers=2)
+
+        self.assertEqual(len(results[0][0]), 4)
+        self.assertIsNone(results[1])
+
+
+if __name__ == '__main__':
+    unittest.main()